@@ -0,0 +1,196 @@
+"""Measure board quality for each grid template and letter weighting scheme.
+
+Run from `word-hunt-service/` with the service's dictionary, e.g.
+
+    python -m bench.boards --dictionary words.txt --boards 1000000
+
+Random boards are generated and solved across a pool of processes. For each template
+and scheme, this reports the distributions of how many words a board holds, and of how
+many points are available on it. Boards holding fewer than `--dead-below` words count
+as dead.
+
+Schemes are `uniform`, `dictionary` (letters weighted by how often they appear in
+dictionary words), `dictionary-sqrt` (halfway between the two), plus any saved weights
+given with `--weights`. Pass `--export` to save a scheme's weights, for the service to
+load through `LETTER_WEIGHTS_PATH`.
+"""
+
+import argparse
+import math
+import multiprocessing
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.solver.domain import MIN_WORD_LEN, solve_grid
+from src.solver.trie import Trie
+from src.versus_game.domain import (
+    GAME_MODES,
+    GRID_TEMPLATES,
+    MAX_WORD_LEN,
+    GameMode,
+    GameModeName,
+    GridTemplateName,
+    random_grid,
+)
+from src.versus_game.letters import ALPHABET, LetterSampler
+
+Job = tuple[GridTemplateName, str, LetterSampler, GameMode, int]
+"""(template name, scheme name, sampler, mode to score by, how many boards)."""
+
+JobResult = tuple[GridTemplateName, str, Counter[int], Counter[int]]
+"""(template name, scheme name, boards by word count, boards by available points)."""
+
+_trie: Trie | None = None
+"""The dictionary, loaded once per worker process."""
+
+
+def init_worker(dictionary_path: str) -> None:
+    global _trie  # noqa: PLW0603
+    _trie = Trie.from_file(dictionary_path)
+    # Forked workers inherit one random state, they'd all draw the same boards
+    random.seed()
+
+
+def run_job(job: Job) -> JobResult:
+    """Generate and solve a batch of boards, tallying them up."""
+    template_name, scheme_name, sampler, mode, boards = job
+    if _trie is None:
+        raise ValueError("Worker was not initialized with a dictionary")
+    template = GRID_TEMPLATES[template_name]
+    word_counts: Counter[int] = Counter()
+    points: Counter[int] = Counter()
+    for _ in range(boards):
+        words = solve_grid(random_grid(template, sampler), _trie)
+        word_counts[len(words)] += 1
+        points[sum(mode.word_points(word) for word in words)] += 1
+    return template_name, scheme_name, word_counts, points
+
+
+def dictionary_schemes(dictionary_path: str) -> dict[str, LetterSampler]:
+    """Build schemes weighting letters by their frequency in playable words."""
+    with Path(dictionary_path).open(encoding="utf-8") as f:
+        words = [line.strip().upper() for line in f]
+    counts = Counter(
+        letter
+        for word in words
+        if word.isalpha() and MIN_WORD_LEN <= len(word) <= MAX_WORD_LEN
+        for letter in word
+    )
+    frequencies = {letter: counts[letter] / counts.total() for letter in ALPHABET}
+    return {
+        "dictionary": LetterSampler(frequencies),
+        "dictionary-sqrt": LetterSampler(
+            {letter: math.sqrt(freq) for letter, freq in frequencies.items()}
+        ),
+    }
+
+
+def split_jobs(
+    templates: list[GridTemplateName],
+    schemes: dict[str, LetterSampler],
+    mode: GameMode,
+    boards: int,
+    chunk_size: int,
+) -> Iterator[Job]:
+    """Split the boards for each template and scheme into evenly sized jobs."""
+    for template_name in templates:
+        for scheme_name, sampler in schemes.items():
+            for start in range(0, boards, chunk_size):
+                chunk = min(chunk_size, boards - start)
+                yield template_name, scheme_name, sampler, mode, chunk
+
+
+def quantile(histogram: Counter[int], q: float) -> int:
+    """The value at the given quantile, of a histogram of values to their counts."""
+    target = q * histogram.total()
+    seen = 0
+    for val in sorted(histogram):
+        seen += histogram[val]
+        if seen >= target:
+            return val
+    raise ValueError("Cannot take a quantile of an empty histogram")
+
+
+def summarize(histogram: Counter[int]) -> str:
+    """Format a histogram as its mean and 10th, 50th and 90th percentiles."""
+    mean = statistics.fmean(histogram.keys(), weights=histogram.values())
+    quantiles = "/".join(str(quantile(histogram, q)) for q in (0.1, 0.5, 0.9))
+    return f"{mean:.0f}/{quantiles}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dictionary", required=True, help="Newline-separated words")
+    parser.add_argument("--boards", type=int, default=10_000, help="Per combination")
+    parser.add_argument(
+        "--templates", nargs="+", default=list(GRID_TEMPLATES), choices=GRID_TEMPLATES
+    )
+    parser.add_argument(
+        "--mode", default="classic", choices=GAME_MODES, help="Mode to score by"
+    )
+    parser.add_argument(
+        "--weights", nargs="*", default=[], help="Saved weights to compare, by path"
+    )
+    parser.add_argument("--dead-below", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--export", help="Path to save the export scheme's weights to")
+    parser.add_argument("--export-scheme", default="dictionary-sqrt")
+    args = parser.parse_args()
+
+    schemes = {"uniform": LetterSampler.uniform()}
+    schemes.update(dictionary_schemes(args.dictionary))
+    for path in args.weights:
+        schemes[Path(path).stem] = LetterSampler.from_file(path)
+
+    if args.export:
+        schemes[args.export_scheme].save(args.export)
+        print(f"saved {args.export_scheme} weights to {args.export}")
+
+    mode_name: GameModeName = args.mode
+    jobs = list(
+        split_jobs(
+            args.templates,
+            schemes,
+            GAME_MODES[mode_name],
+            args.boards,
+            args.chunk_size,
+        )
+    )
+    word_counts: dict[tuple[str, str], Counter[int]] = {}
+    points: dict[tuple[str, str], Counter[int]] = {}
+    start = time.perf_counter()
+    with multiprocessing.Pool(
+        args.processes, initializer=init_worker, initargs=(args.dictionary,)
+    ) as pool:
+        for template_name, scheme_name, job_words, job_points in pool.imap_unordered(
+            run_job, jobs
+        ):
+            key = (template_name, scheme_name)
+            word_counts.setdefault(key, Counter()).update(job_words)
+            points.setdefault(key, Counter()).update(job_points)
+    elapsed = time.perf_counter() - start
+    total_boards = sum(counts.total() for counts in word_counts.values())
+    print(f"solved {total_boards} boards in {elapsed:.1f}s\n")
+
+    print(
+        f"{'template':<10} {'scheme':<16} {'dead':>6} "
+        f"{'words mean/p10/p50/p90':<24} {'points mean/p10/p50/p90':<30}"
+    )
+    for template_name in args.templates:
+        for scheme_name in schemes:
+            words = word_counts[template_name, scheme_name]
+            pts = points[template_name, scheme_name]
+            dead = sum(n for count, n in words.items() if count < args.dead_below)
+            print(
+                f"{template_name:<10} {scheme_name:<16} {dead / words.total():>6.1%} "
+                f"{summarize(words):<24} {summarize(pts):<30}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure how long the service takes from launch to serving its first requests.
+
+Run from `word-hunt-service/` against a migrated Postgres, e.g.
+
+    POSTGRES_URL=postgresql://postgres@localhost:5432 python bench/startup.py
+
+Each run launches the server, then times the first successful `/ping` and the first
+successful `/match` (two sessions matching each other), then stops the server. The
+`/match` time includes a fixed `QUEUE_JOIN_SECS` head start for the first session.
+"""
+
+import argparse
+import asyncio
+import shlex
+import statistics
+import time
+from uuid import uuid4
+
+import httpx
+
+DEFAULT_CMD = "gunicorn -c gunicorn.conf.py main:app"
+
+QUEUE_JOIN_SECS = 0.2
+"""Head start for the first session of a pair to join the match queue."""
+
+
+async def wait_for_ping(client: httpx.AsyncClient, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            resp = await client.get("/ping")
+            if resp.status_code == 200:  # noqa: PLR2004
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.01)
+    raise TimeoutError("Server never answered /ping")
+
+
+async def match_pair(client: httpx.AsyncClient) -> None:
+    """Match two fresh sessions with each other, returns once the second has matched.
+
+    The first session has to be on the queue before the second arrives, or both would
+    join the queue and wait it out.
+    """
+    queued = asyncio.create_task(
+        client.post("/match", headers={"x-session-id": str(uuid4())})
+    )
+    await asyncio.sleep(QUEUE_JOIN_SECS)
+    resp = await client.post("/match", headers={"x-session-id": str(uuid4())})
+    resp.raise_for_status()
+    if resp.json()["game_id"] is None:
+        raise ValueError("Sessions did not match each other")
+    await queued
+
+
+async def run_once(
+    cmd: list[str], base_url: str, timeout: float
+) -> tuple[float, float]:
+    """Launch the server once. Returns secs to first /ping, and to first /match."""
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(*cmd)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            await wait_for_ping(client, start + timeout)
+            ping_secs = time.perf_counter() - start
+            await match_pair(client)
+            match_secs = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        await proc.wait()
+    return ping_secs, match_secs
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cmd", default=DEFAULT_CMD, help="Command to launch with")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    results = []
+    for i in range(args.runs):
+        ping_secs, match_secs = await run_once(
+            shlex.split(args.cmd), args.url, args.timeout
+        )
+        print(f"run {i}: first /ping {ping_secs:.3f}s, first /match {match_secs:.3f}s")
+        results.append((ping_secs, match_secs))
+
+    print(
+        f"median: first /ping {statistics.median(r[0] for r in results):.3f}s, "
+        f"first /match {statistics.median(r[1] for r in results):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
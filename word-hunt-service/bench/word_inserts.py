@@ -0,0 +1,160 @@
+"""Measure submitted word insert throughput, written directly or batched behind.
+
+Run from `word-hunt-service/` against a migrated Postgres, e.g.
+
+    POSTGRES_URL=postgresql://postgres@localhost:5432 python -m bench.word_inserts
+
+Without `POSTGRES_URL` this runs against the in-memory backend, which only measures
+the service's own overhead. Each run creates fresh games, then has `--clients`
+concurrent clients each submit `--submits` small batches of words. Direct writes insert
+each submission on its own pooled connection, like `/submit-words` does by default.
+Batched writes go through a `SubmittedWordWriter`, and are only counted done once
+closing it has written everything.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import UUID, uuid4
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from src.repositories import (
+    InMemoryRepositoryBackend,
+    PostgresRepositoryBackend,
+    RepositoryBackend,
+)
+from src.versus_game.domain import GAME_MODES, Point, random_template_and_grid
+from src.versus_game.letters import UNIFORM_LETTERS
+from src.versus_game.word_writer import SubmittedWordWriter
+
+POSTGRES_URL = os.getenv("POSTGRES_URL", "")
+
+
+@asynccontextmanager
+async def open_backend(pool_size: int) -> AsyncIterator[RepositoryBackend]:
+    if not POSTGRES_URL:
+        yield InMemoryRepositoryBackend()
+        return
+    async with AsyncConnectionPool(
+        conninfo=POSTGRES_URL,
+        connection_class=AsyncConnection,
+        kwargs={"autocommit": True},
+        min_size=pool_size,
+        max_size=pool_size,
+    ) as pool:
+        await pool.wait()
+        yield PostgresRepositoryBackend(pool)
+
+
+async def create_games(
+    backend: RepositoryBackend, count: int
+) -> list[tuple[UUID, UUID]]:
+    """Create games, returning a (game id, session id) to submit as in each."""
+    mode = GAME_MODES["classic"]
+    out: list[tuple[UUID, UUID]] = []
+    async with backend.repositories() as repositories:
+        for _ in range(count):
+            game_id, session_id = uuid4(), uuid4()
+            await repositories.versus_game.create_versus_game(
+                game_id,
+                session_id,
+                uuid4(),
+                random_template_and_grid(mode, UNIFORM_LETTERS),
+                mode,
+            )
+            out.append((game_id, session_id))
+    return out
+
+
+def random_words(count: int) -> list[tuple[str, list[Point]]]:
+    path = [Point(x=0, y=0), Point(x=1, y=0), Point(x=2, y=0)]
+    return [
+        ("".join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=3)), path)  # noqa: S311
+        for _ in range(count)
+    ]
+
+
+async def run_direct(
+    backend: RepositoryBackend,
+    players: list[tuple[UUID, UUID]],
+    submits: int,
+    words: int,
+) -> list[float]:
+    """Submit straight to the DB. Returns each submission's latency."""
+    latencies: list[float] = []
+
+    async def client(game_id: UUID, session_id: UUID) -> None:
+        for _ in range(submits):
+            start = time.perf_counter()
+            async with backend.repositories() as repositories:
+                await repositories.versus_game.update_versus_game_submit_words(
+                    game_id, session_id, random_words(words)
+                )
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(*player) for player in players))
+    return latencies
+
+
+async def run_batched(
+    backend: RepositoryBackend,
+    players: list[tuple[UUID, UUID]],
+    submits: int,
+    words: int,
+) -> list[float]:
+    """Submit through the write-behind. Returns each submission's latency."""
+    writer = SubmittedWordWriter(backend)
+    writer_task = asyncio.create_task(writer.run())
+    latencies: list[float] = []
+
+    async def client(game_id: UUID, session_id: UUID) -> None:
+        for _ in range(submits):
+            start = time.perf_counter()
+            writer.submit(game_id, session_id, random_words(words))
+            latencies.append(time.perf_counter() - start)
+            # Yield like a request handler would between submissions
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(client(*player) for player in players))
+    writer.close()
+    await writer_task
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--submits", type=int, default=20, help="Per client")
+    parser.add_argument("--words", type=int, default=2, help="Per submission")
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    total_words = args.clients * args.submits * args.words
+    async with open_backend(args.pool_size) as backend:
+        for name, run in (("direct", run_direct), ("batched", run_batched)):
+            rates: list[float] = []
+            for i in range(args.runs):
+                players = await create_games(backend, args.clients)
+                start = time.perf_counter()
+                latencies = await run(backend, players, args.submits, args.words)
+                elapsed = time.perf_counter() - start
+                rates.append(total_words / elapsed)
+                print(
+                    f"{name} run {i}: {total_words} words in {elapsed:.3f}s "
+                    f"({rates[-1]:.0f} words/s), submit p50 "
+                    f"{statistics.median(latencies) * 1000:.2f}ms, p99 "
+                    f"{statistics.quantiles(latencies, n=100)[98] * 1000:.2f}ms"
+                )
+            print(f"{name} median: {statistics.median(rates):.0f} words/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
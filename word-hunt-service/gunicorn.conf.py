@@ -0,0 +1,55 @@
+"""Production server config, run with `gunicorn -c gunicorn.conf.py main:app`.
+
+Each worker is a single asyncio event loop, so one worker per core saturates the
+machine. Every worker has its own connection pool, so Postgres' `max_connections` must
+allow for `workers * POOL_MAX_SIZE`.
+"""
+
+import gc
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+
+from gunicorn.workers.base import Worker
+
+from src.instrumentation.metrics import retire_metrics_snapshot
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+# The app splits per-process limits between the workers, so tell it how many there are
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# The in-memory backend lives in each worker, so each would only see its own games
+if os.getenv("REPOSITORY_BACKEND") == "memory" and workers > 1:
+    raise ValueError("REPOSITORY_BACKEND=memory requires WEB_CONCURRENCY=1")
+
+# Each worker counts its own metrics, so they share snapshots through a directory for
+# whichever worker serves /metrics to sum
+os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="word-hunt-metrics-"))
+
+# Import the app once in the master before forking, so that module-level caches (e.g.
+# the dictionary) are built once and shared copy-on-write across workers
+preload_app = True
+
+# Lifespan (pool prewarm) must finish before a worker reports ready
+timeout = 60
+graceful_timeout = 30
+
+
+def on_starting(_server: object) -> None:
+    # Don't sum in snapshots from a previous run of the server
+    for path in Path(os.environ["METRICS_DIR"]).glob("*.json"):
+        path.unlink()
+
+
+def child_exit(_server: object, worker: Worker) -> None:
+    # Keep the exited worker's counts, in one file with every other exited worker's
+    retire_metrics_snapshot(Path(os.environ["METRICS_DIR"]), worker.pid)
+
+
+def when_ready(_server: object) -> None:
+    # Move everything loaded so far out of the GC's reach, so collections in workers
+    # don't write to (and so copy) the shared pages
+    gc.freeze()
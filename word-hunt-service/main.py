@@ -1,50 +1,204 @@
+import asyncio
+import math
 import os
+import secrets
+import socket
+import threading
 import time
 from asyncio import sleep
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
-from typing import Annotated
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Annotated, cast
 from uuid import UUID, uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from psycopg import AsyncConnection
 from psycopg_pool import AsyncConnectionPool
 from pydantic import BaseModel
 
+from src import utils
+from src.concurrency import SessionRateLimiter, SingleFlight
+from src.game_ownership.middleware import GameOwnershipMiddleware
+from src.game_ownership.router import GameOwnershipRouter, parse_replica_urls
+from src.instrumentation.metrics import (
+    POLL_ITERATIONS,
+    RATE_LIMITED,
+    SNAPSHOT_INTERVAL_SECS,
+    render_metrics,
+    write_metrics_snapshot,
+)
+from src.instrumentation.middleware import RouteTimingMiddleware
+from src.instrumentation.profiler import MAX_PROFILE_SECS, SamplingProfiler
+from src.repositories import (
+    InMemoryRepositoryBackend,
+    PostgresRepositoryBackend,
+    Repositories,
+    RepositoryBackend,
+)
+from src.seeded_puzzle.constants import (
+    DAILY_PUZZLE_MODE,
+    LEADERBOARD_MAX_LIMIT,
+    SOLVED_PUZZLE_CACHE_SIZE,
+)
+from src.seeded_puzzle.domain import (
+    SeededPuzzle,
+    SolvedPuzzle,
+    daily_seed,
+    seeded_grid,
+)
+from src.solver.domain import solve_grid
+from src.solver.trie import Trie
+from src.utils import LRUCache
+from src.versus_bot.domain import BOT_SKILLS, BotSkillName
+from src.versus_bot.scheduler import VersusBotScheduler
+from src.versus_game.constants import (
+    FINALIZED_GAME_CACHE_SIZE,
+    WORD_WRITE_SETTLE_SECS,
+)
 from src.versus_game.domain import (
+    GAME_MODES,
+    GameMode,
+    GameModeName,
     Grid,
+    OrientedPlayers,
+    VersusGame,
+    extract_word,
     random_template_and_grid,
 )
 from src.versus_game.domain import (
     Point as VersusGamePoint,
 )
-from src.versus_game.repository import VersusGameRepository
-from src.versus_match_queue.repository import VersusMatchQueueRepository
+from src.versus_game.letters import UNIFORM_LETTERS, LetterSampler
+from src.versus_game.service import InvalidPathError, VersusGameService
 
 ENVIRONMENT = os.getenv("ENV", "prod")
 POSTGRES_URL = os.getenv("POSTGRES_URL", "")
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "postgres")
+DICTIONARY_PATH = os.getenv("DICTIONARY_PATH", "")
+LETTER_WEIGHTS_PATH = os.getenv("LETTER_WEIGHTS_PATH", "")
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+BOT_SKILL = BOT_SKILLS[cast(BotSkillName, os.getenv("BOT_SKILL", "medium"))]
+POOL_MIN_SIZE = int(os.getenv("POOL_MIN_SIZE", "4"))
+POOL_MAX_SIZE = int(os.getenv("POOL_MAX_SIZE", "16"))
+REPLICA_ID = os.getenv("REPLICA_ID", socket.gethostname())
+REPLICAS = os.getenv("REPLICAS", "")
+WORD_WRITE_BEHIND = os.getenv("WORD_WRITE_BEHIND", "") == "1"
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Loaded at import rather than in lifespan, so a preloading server (see
+# gunicorn.conf.py) loads it once and shares it copy-on-write across its workers
+dictionary: Trie | None = Trie.from_file(DICTIONARY_PATH) if DICTIONARY_PATH else None
+letters: LetterSampler = (
+    LetterSampler.from_file(LETTER_WEIGHTS_PATH)
+    if LETTER_WEIGHTS_PATH
+    else UNIFORM_LETTERS
+)
+
+repository_backend: RepositoryBackend | None = None
+bot_scheduler: VersusBotScheduler | None = None
+versus_game_service: VersusGameService | None = None
+profiler = SamplingProfiler()
 
-pool: AsyncConnectionPool | None = None
+# Routing games to owners is only worth it with several replicas
+ownership_router: GameOwnershipRouter | None = (
+    GameOwnershipRouter(REPLICA_ID, parse_replica_urls(REPLICAS)) if REPLICAS else None
+)
+
+# Each worker limits its share, see `SessionRateLimiter`
+MATCH_RATE_LIMITER = SessionRateLimiter(
+    "match", rate_per_sec=0.5, burst=3, processes=WORKERS
+)
+GAME_RATE_LIMITER = SessionRateLimiter(
+    "game", rate_per_sec=10, burst=30, processes=WORKERS
+)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
-    global pool  # noqa: PLW0603
+async def open_repository_backend() -> AsyncIterator[RepositoryBackend]:
+    # Benchmarks and single-process deployments may skip Postgres entirely
+    if REPOSITORY_BACKEND == "memory":
+        yield InMemoryRepositoryBackend()
+        return
+
     async with AsyncConnectionPool(
         conninfo=POSTGRES_URL,
         connection_class=AsyncConnection,
         kwargs={"autocommit": True},
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        check=AsyncConnectionPool.check_connection,
     ) as conn_pool:
-        pool = conn_pool
+        # Don't take traffic until the pool is warm, so early requests don't pay for
+        # connecting
+        await conn_pool.wait()
+        yield PostgresRepositoryBackend(conn_pool)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    global repository_backend, bot_scheduler, versus_game_service  # noqa: PLW0603
+    async with AsyncExitStack() as stack:
+        backend = await stack.enter_async_context(open_repository_backend())
+        repository_backend = backend
+        if ownership_router is not None:
+            await stack.enter_async_context(ownership_router.running(backend))
+
+        # Batching submitted words trades a short window of possible loss for fewer,
+        # larger writes, so it's opt-in
+        versus_games = VersusGameService(backend, write_behind=WORD_WRITE_BEHIND)
+        versus_game_service = versus_games
+        word_writer = versus_games.word_writer
+        writer_task: asyncio.Task[None] | None = None
+        if word_writer is not None:
+            writer_task = asyncio.create_task(word_writer.run())
+
+        # Bots need a dictionary to solve boards with, only run them if we have one
+        bot_task: asyncio.Task[None] | None = None
+        if dictionary is not None:
+            bot_scheduler = VersusBotScheduler(versus_games, dictionary)
+            bot_task = asyncio.create_task(bot_scheduler.run())
+
+        # Workers share snapshots so any one of them can serve everyone's metrics
+        metrics_task: asyncio.Task[None] | None = None
+        if METRICS_DIR:
+            metrics_task = asyncio.create_task(snapshot_metrics(Path(METRICS_DIR)))
+
         yield
+
+        if metrics_task is not None:
+            metrics_task.cancel()
+            write_metrics_snapshot(Path(METRICS_DIR))
+        if bot_task is not None:
+            bot_task.cancel()
+        # Write every accepted word before the backend closes
+        if word_writer is not None and writer_task is not None:
+            word_writer.close()
+            await writer_task
     print("closing...")
 
 
-async def get_session_id(request: Request, response: Response) -> UUID:
+async def snapshot_metrics(snapshot_dir: Path) -> None:
+    while True:
+        write_metrics_snapshot(snapshot_dir)
+        await sleep(SNAPSHOT_INTERVAL_SECS)
+
+
+def request_session_id(request: Request) -> str | None:
+    """The session id the client sent, if any."""
     session_id: str | None = request.cookies.get("session_id")
     if session_id is None:
         session_id = request.headers.get("x-session-id")
+    return session_id
+
+
+async def get_session_id(request: Request, response: Response) -> UUID:
+    session_id = request_session_id(request)
     if session_id is None:
         session_id = str(uuid4())
         response.set_cookie(
@@ -56,15 +210,53 @@ async def get_session_id(request: Request, response: Response) -> UUID:
     return UUID(session_id)
 
 
-async def get_db_conn() -> AsyncGenerator[AsyncConnection]:
-    if pool is None:
-        raise ValueError("Cannot access connection pool")
-    async with pool.connection() as db_conn:
-        yield db_conn
+@asynccontextmanager
+async def borrow_repositories() -> AsyncIterator[Repositories]:
+    if repository_backend is None:
+        raise ValueError("Cannot access repository backend")
+    async with repository_backend.repositories() as repositories:
+        yield repositories
+
+
+async def get_repositories() -> AsyncGenerator[Repositories]:
+    async with borrow_repositories() as repositories:
+        yield repositories
+
+
+def rate_limit(limiter: SessionRateLimiter) -> Callable[..., Awaitable[None]]:
+    """Build a dependency which rejects the session's request once over the limit."""
+
+    async def dependency(
+        request: Request, session_id: Annotated[UUID, Depends(get_session_id)]
+    ) -> None:
+        # A request without a session is minting one, and the cookie set on its
+        # response keys the client's next request. Behind a proxy every such request
+        # shares an address, so there's nothing better to key it on
+        if request_session_id(request) is None:
+            return
+        retry_after = limiter.acquire(session_id)
+        if retry_after > 0:
+            RATE_LIMITED.inc(limiter=limiter.name)
+            raise HTTPException(
+                status_code=429, headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    return dependency
+
+
+def get_versus_game_service() -> VersusGameService:
+    if versus_game_service is None:
+        raise ValueError("Cannot access versus game service")
+    return versus_game_service
 
 
 app = FastAPI(lifespan=lifespan, root_path="/api")
 
+if ownership_router is not None:
+    app.add_middleware(GameOwnershipMiddleware, router=ownership_router)
+
+app.add_middleware(RouteTimingMiddleware)
+
 if ENVIRONMENT == "dev":
     app.add_middleware(
         CORSMiddleware,
@@ -85,6 +277,44 @@ async def ping() -> str:
     return "OK"
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(Path(METRICS_DIR) if METRICS_DIR else None))
+
+
+async def require_profiler_token(
+    x_profiler_token: Annotated[str | None, Header()] = None,
+) -> None:
+    # Hide the profiler entirely unless it's configured and the token matches
+    if (
+        not PROFILER_TOKEN
+        or x_profiler_token is None
+        or not secrets.compare_digest(x_profiler_token, PROFILER_TOKEN)
+    ):
+        raise HTTPException(status_code=404)
+
+
+@app.post(
+    "/debug/profiler/profile",
+    include_in_schema=False,
+    dependencies=[Depends(require_profiler_token)],
+)
+async def profiler_profile(
+    secs: Annotated[float, Query(gt=0, le=MAX_PROFILE_SECS)] = 10,
+) -> PlainTextResponse:
+    # Start and stop within one request, so both land on the same worker
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="Already profiling")
+
+    # Handlers run on the event loop thread, which is the one worth sampling
+    profiler.start(threading.get_ident())
+    try:
+        await sleep(secs)
+    finally:
+        samples = profiler.stop()
+    return PlainTextResponse(samples, headers={"x-profiler-pid": str(os.getpid())})
+
+
 @app.get("/cookie0")
 async def cookie0(response: Response) -> None:
     response.set_cookie(
@@ -99,25 +329,58 @@ class PostMatchResp(BaseModel):
     game_id: UUID | None
 
 
-@app.post("/match")
+match_flights: SingleFlight[tuple[UUID, GameModeName], PostMatchResp] = SingleFlight()
+"""In-flight matchmaking, by session id and game mode."""
+
+
+@app.post("/match", dependencies=[Depends(rate_limit(MATCH_RATE_LIMITER))])
 async def match(
     session_id: Annotated[UUID, Depends(get_session_id)],
-    db_conn: Annotated[AsyncConnection, Depends(get_db_conn)],
+    mode: GameModeName = "classic",
+) -> PostMatchResp:
+    # Concurrent calls from one session share a single place in the queue, and a
+    # single connection. Calls on other workers share the queue entry at least
+    async def find_match_in_flight() -> PostMatchResp:
+        async with borrow_repositories() as repositories:
+            return await find_match(session_id, mode, repositories)
+
+    return await match_flights.do((session_id, mode), find_match_in_flight)
+
+
+async def find_match(
+    session_id: UUID, mode_name: GameModeName, repositories: Repositories
 ) -> PostMatchResp:
     # To limit polling later in fn
     start_time = time.time()
     max_total_request_time = 50
 
-    # Construct repositories
-    versus_match_queue_repository = VersusMatchQueueRepository(db_conn)
-    versus_game_repository = VersusGameRepository(db_conn)
+    versus_match_queue_repository = repositories.versus_match_queue
+    versus_game_repository = repositories.versus_game
+    mode = GAME_MODES[mode_name]
 
     # Try to get a match
-    match = await versus_match_queue_repository.match(session_id)
+    match = await versus_match_queue_repository.match(session_id, mode_name)
 
-    # We did not get a match
+    # We did not get a match, play against a bot if we can
     if match is None:
-        return PostMatchResp(game_id=None)
+        if bot_scheduler is None:
+            return PostMatchResp(game_id=None)
+        # The bot plays from this replica, so make it the game's owner
+        game_id = (
+            uuid4()
+            if ownership_router is None
+            else ownership_router.new_owned_game_id()
+        )
+        bot_session_id = uuid4()
+        game = await versus_game_repository.create_versus_game(
+            game_id,
+            bot_session_id,
+            session_id,
+            random_template_and_grid(mode, letters),
+            mode,
+        )
+        bot_scheduler.add(game_id, bot_session_id, game.grid, mode, BOT_SKILL)
+        return PostMatchResp(game_id=game_id)
 
     # If it's our responsibility to construct the game, construct and return
     if match.must_create_game:
@@ -125,12 +388,14 @@ async def match(
             match.game_id,
             match.matched_player_session_id,
             session_id,
-            random_template_and_grid(),
+            random_template_and_grid(mode, letters),
+            mode,
         )
         return PostMatchResp(game_id=match.game_id)
 
     # It's the match partner's responsibility to construct the game, poll until exists
     while (time.time() - start_time) < max_total_request_time:
+        POLL_ITERATIONS.inc(loop="match_game_created")
         result = await versus_game_repository.get_versus_game(match.game_id)
         if result is not None:
             return PostMatchResp(game_id=result.game_id)
@@ -149,20 +414,79 @@ class GetGameRespPlayer(BaseModel):
 class GetGameResp(BaseModel):
     game_id: UUID
     grid: Grid
+    mode: GameModeName
     ended: bool
     this_player: GetGameRespPlayer
     other_player: GetGameRespPlayer
 
 
-@app.get("/game/{game_id}")
+@dataclass(frozen=True)
+class GameRespBody:
+    """A serialized `GetGameResp`, with the ETag identifying it."""
+
+    etag: str
+    body: bytes
+
+
+finalized_game_bodies: LRUCache[tuple[UUID, UUID], GameRespBody] = LRUCache(
+    FINALIZED_GAME_CACHE_SIZE
+)
+"""Views of games that can no longer change, by (game id, session id)."""
+
+
+def game_resp_headers(etag: str) -> dict[str, str]:
+    # Views are per-session, and the client must revalidate since clocks run down
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def game_resp(request: Request, resp_body: GameRespBody) -> Response:
+    """Respond with the given game view, or with a 304 if the client already has it."""
+    headers = game_resp_headers(resp_body.etag)
+    if request.headers.get("if-none-match") == resp_body.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=resp_body.body, media_type="application/json", headers=headers
+    )
+
+
+def game_etag(game: VersusGame, players: OrientedPlayers) -> str:
+    """Identify a session's view of a game.
+
+    Besides the version, the view changes over time as clocks run down. Whole seconds
+    are enough to tell a poll apart from the previous one.
+    """
+    secs = [
+        "-" if secs is None else str(math.ceil(secs))
+        for secs in (
+            players.this_player.play_secs_remaining(),
+            players.other_player.play_secs_remaining(),
+        )
+    ]
+    return f'W/"{game.version}-{game.ended():d}-{secs[0]}-{secs[1]}"'
+
+
+@app.get(
+    "/game/{game_id}",
+    response_model=GetGameResp,
+    dependencies=[Depends(rate_limit(GAME_RATE_LIMITER))],
+)
 async def get_game(
     game_id: UUID,
+    request: Request,
     session_id: Annotated[UUID, Depends(get_session_id)],
-    db_conn: Annotated[AsyncConnection, Depends(get_db_conn)],
-) -> GetGameResp:
+) -> Response:
+    # Finalized games never change, serve them without touching the DB
+    cached = finalized_game_bodies.get((game_id, session_id))
+    if cached is not None:
+        return game_resp(request, cached)
+
+    # Check before loading, words written after the load started may be missing from it
+    versus_games = get_versus_game_service()
+    word_writer = versus_games.word_writer
+    unwritten = word_writer is not None and word_writer.has_unwritten(game_id)
+
     # Construct the Game domain model
-    versus_game_repository = VersusGameRepository(db_conn)
-    game = await versus_game_repository.get_versus_game(game_id)
+    game = await versus_games.load(game_id)
     if game is None:
         raise HTTPException(status_code=404)
 
@@ -171,10 +495,16 @@ async def get_game(
     if players is None:
         raise HTTPException(status_code=403)
 
+    # Skip building the resp if the client already has this version of it
+    etag = game_etag(game, players)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=game_resp_headers(etag))
+
     # Build resp
-    return GetGameResp(
+    resp = GetGameResp(
         game_id=game.game_id,
         grid=game.grid,
+        mode=game.mode.name,
         ended=game.ended(),
         this_player=GetGameRespPlayer(
             seconds_remaining=players.this_player.play_secs_remaining(),
@@ -187,17 +517,39 @@ async def get_game(
             words=[word.word for word in players.other_player.submitted_words],
         ),
     )
+    resp_body = GameRespBody(etag=etag, body=resp.model_dump_json().encode())
+    # Words still being written behind would be missing from the cached view forever
+    if game.finalized() and not unwritten and words_settled(game):
+        finalized_game_bodies.put((game_id, session_id), resp_body)
+    return game_resp(request, resp_body)
+
+
+def words_settled(game: VersusGame) -> bool:
+    """Whether every worker and replica has written the game's words, even writing
+    behind.
+
+    Flushing on done only covers the words this process holds, a player's earlier
+    submits may have landed on another worker. So wait out the game's auto-end, past
+    which nobody accepts words, however early both players are done.
+    """
+    if get_versus_game_service().word_writer is None:
+        return True
+    return (
+        utils.elapsed_secs(game.created_at) - game.mode.auto_end_secs()
+        >= WORD_WRITE_SETTLE_SECS
+    )
 
 
-@app.post("/game/{game_id}/start")
+@app.post(
+    "/game/{game_id}/start", dependencies=[Depends(rate_limit(GAME_RATE_LIMITER))]
+)
 async def game_start(
     game_id: UUID,
     session_id: Annotated[UUID, Depends(get_session_id)],
-    db_conn: Annotated[AsyncConnection, Depends(get_db_conn)],
 ) -> None:
     # Construct the Game domain model
-    versus_game_repository = VersusGameRepository(db_conn)
-    game = await versus_game_repository.get_versus_game(game_id)
+    versus_games = get_versus_game_service()
+    game = await versus_games.load(game_id)
     if game is None:
         raise HTTPException(status_code=404)
 
@@ -206,27 +558,29 @@ async def game_start(
     if players is None:
         raise HTTPException(status_code=403)
 
-    await versus_game_repository.update_versus_game_player_start(game_id, session_id)
+    await versus_games.start(game_id, session_id)
 
 
 class SubmitWordsReq(BaseModel):
     paths: list[list[Point]]
 
 
-@app.post("/game/{game_id}/submit-words")
+@app.post(
+    "/game/{game_id}/submit-words",
+    dependencies=[Depends(rate_limit(GAME_RATE_LIMITER))],
+)
 async def game_submit_words(
     game_id: UUID,
     req: SubmitWordsReq,
     session_id: Annotated[UUID, Depends(get_session_id)],
-    db_conn: Annotated[AsyncConnection, Depends(get_db_conn)],
 ) -> None:
     # Ensure paths submitted
     if len(req.paths) == 0:
         raise HTTPException(status_code=400, detail="No paths provided")
 
     # Construct the Game domain model
-    versus_game_repository = VersusGameRepository(db_conn)
-    game = await versus_game_repository.get_versus_game(game_id)
+    versus_games = get_versus_game_service()
+    game = await versus_games.load(game_id)
     if game is None:
         raise HTTPException(status_code=404)
 
@@ -239,37 +593,24 @@ async def game_submit_words(
     if not game.player_may_submit(session_id):
         raise HTTPException(status_code=400, detail="Submissions no longer accepted")
 
-    # An attempt to submit words qualifies as starting the game, even if words invalid
-    if players.this_player.start is None:
-        await versus_game_repository.update_versus_game_player_start(
-            game_id, session_id
-        )
-
-    # Extract words and validate
-    validated_words: list[tuple[str, list[VersusGamePoint]]] = []
-    for i, req_path in enumerate(req.paths):
-        path = [VersusGamePoint(x=point.x, y=point.y) for point in req_path]
-        word = game.extract_word(path)
-        if word is None:
-            raise HTTPException(status_code=400, detail=f"Path {i} invalid")
-        # TODO: Validate word in dictionary
-        validated_words.append((word, path))
-
-    # Insert the words into the db
-    await versus_game_repository.update_versus_game_submit_words(
-        game_id, session_id, validated_words
-    )
+    paths = [
+        [VersusGamePoint(x=point.x, y=point.y) for point in req_path]
+        for req_path in req.paths
+    ]
+    try:
+        await versus_games.submit_words(game, session_id, paths)
+    except InvalidPathError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@app.post("/game/{game_id}/done")
+@app.post("/game/{game_id}/done", dependencies=[Depends(rate_limit(GAME_RATE_LIMITER))])
 async def game_set_player_done(
     game_id: UUID,
     session_id: Annotated[UUID, Depends(get_session_id)],
-    db_conn: Annotated[AsyncConnection, Depends(get_db_conn)],
 ) -> None:
     # Construct the Game domain model
-    versus_game_repository = VersusGameRepository(db_conn)
-    game = await versus_game_repository.get_versus_game(game_id)
+    versus_games = get_versus_game_service()
+    game = await versus_games.load(game_id)
     if game is None:
         raise HTTPException(status_code=404)
 
@@ -278,4 +619,249 @@ async def game_set_player_done(
     if players is None:
         raise HTTPException(status_code=403)
 
-    await versus_game_repository.update_versus_game_player_done(game_id, session_id)
+    await versus_games.set_done(game_id, session_id)
+
+
+def require_dictionary() -> None:
+    # Puzzles are validated against their full solution, which needs a dictionary
+    if dictionary is None:
+        raise HTTPException(status_code=404)
+
+
+solved_puzzles: LRUCache[str, SolvedPuzzle] = LRUCache(SOLVED_PUZZLE_CACHE_SIZE)
+"""Solved seeded puzzles, by seed, shared by every player of each."""
+
+puzzle_load_flights: SingleFlight[tuple[str, bool], SolvedPuzzle | None] = (
+    SingleFlight()
+)
+"""In-flight puzzle loads, by seed and whether they may create the puzzle."""
+
+
+async def load_solved_puzzle(
+    seed: str, create_mode: GameMode | None = None
+) -> SolvedPuzzle | None:
+    """Load and solve a puzzle once per process, no matter how many play it.
+
+    If `create_mode` is given, the puzzle is created if it doesn't exist yet.
+    """
+    cached = solved_puzzles.get(seed)
+    if cached is not None:
+        return cached
+
+    async def load() -> SolvedPuzzle | None:
+        if dictionary is None:
+            raise ValueError("Cannot solve puzzles without a dictionary")
+        puzzle: SeededPuzzle | None
+        async with borrow_repositories() as repositories:
+            seeded_puzzle_repository = repositories.seeded_puzzle
+            if create_mode is not None:
+                puzzle = await seeded_puzzle_repository.create_or_get_seeded_puzzle(
+                    seed, create_mode, seeded_grid(seed, create_mode, letters)
+                )
+            else:
+                puzzle = await seeded_puzzle_repository.get_seeded_puzzle(seed)
+        if puzzle is None:
+            return None
+
+        # Solving is CPU-bound, keep it off the event loop
+        solutions = await asyncio.to_thread(solve_grid, puzzle.grid, dictionary)
+        solved = SolvedPuzzle(puzzle=puzzle, solutions=solutions)
+        solved_puzzles.put(seed, solved)
+        return solved
+
+    return await puzzle_load_flights.do((seed, create_mode is not None), load)
+
+
+async def get_solved_puzzle(seed: str) -> SolvedPuzzle:
+    puzzle = await load_solved_puzzle(seed)
+    if puzzle is None:
+        raise HTTPException(status_code=404)
+    return puzzle
+
+
+class GetPuzzleRespPlayer(BaseModel):
+    seconds_remaining: float
+    ended: bool
+    points: int
+    words: list[str]
+    rank: int | None
+    """Only given once ended, among the other players who've finished."""
+
+
+class GetPuzzleResp(BaseModel):
+    seed: str
+    mode: GameModeName
+    grid: Grid
+    total_words: int
+    max_points: int
+    this_player: GetPuzzleRespPlayer | None
+    """Not given until this player starts."""
+
+
+async def build_puzzle_resp(
+    solved: SolvedPuzzle, session_id: UUID, repositories: Repositories
+) -> GetPuzzleResp:
+    seeded_puzzle_repository = repositories.seeded_puzzle
+    result = await seeded_puzzle_repository.get_seeded_puzzle_result(
+        solved.puzzle, session_id
+    )
+    this_player: GetPuzzleRespPlayer | None = None
+    if result is not None:
+        # Words are accepted a while past the clock running out, so points may
+        # still change until then
+        ended = not result.may_submit()
+        this_player = GetPuzzleRespPlayer(
+            seconds_remaining=result.play_secs_remaining(),
+            ended=ended,
+            points=result.points,
+            words=result.words,
+            rank=await seeded_puzzle_repository.get_seeded_puzzle_rank(
+                solved.puzzle, result.points
+            )
+            if ended
+            else None,
+        )
+    return GetPuzzleResp(
+        seed=solved.puzzle.seed,
+        mode=solved.puzzle.mode.name,
+        grid=solved.puzzle.grid,
+        total_words=len(solved.solutions),
+        max_points=solved.max_points,
+        this_player=this_player,
+    )
+
+
+@app.get(
+    "/daily",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def get_daily_puzzle(
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+) -> GetPuzzleResp:
+    # Every player shares today's board, play continues at /puzzle/{seed}
+    seed = daily_seed(datetime.now(UTC).date())
+    solved = await load_solved_puzzle(seed, GAME_MODES[DAILY_PUZZLE_MODE])
+    if solved is None:
+        raise ValueError(f"Expected puzzle {seed} to exist after creating")
+    return await build_puzzle_resp(solved, session_id, repositories)
+
+
+@app.get(
+    "/puzzle/{seed}",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def get_puzzle(
+    seed: str,
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+) -> GetPuzzleResp:
+    solved = await get_solved_puzzle(seed)
+    return await build_puzzle_resp(solved, session_id, repositories)
+
+
+@app.post(
+    "/puzzle/{seed}/start",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def puzzle_start(
+    seed: str,
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+) -> None:
+    await get_solved_puzzle(seed)
+    await repositories.seeded_puzzle.update_seeded_puzzle_result_start(seed, session_id)
+
+
+@app.post(
+    "/puzzle/{seed}/submit-words",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def puzzle_submit_words(
+    seed: str,
+    req: SubmitWordsReq,
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+) -> None:
+    # Ensure paths submitted
+    if len(req.paths) == 0:
+        raise HTTPException(status_code=400, detail="No paths provided")
+
+    solved = await get_solved_puzzle(seed)
+    seeded_puzzle_repository = repositories.seeded_puzzle
+
+    # An attempt to submit words qualifies as starting the puzzle, even if invalid
+    result = await seeded_puzzle_repository.get_seeded_puzzle_result(
+        solved.puzzle, session_id
+    )
+    if result is None:
+        await seeded_puzzle_repository.update_seeded_puzzle_result_start(
+            seed, session_id
+        )
+    elif not result.may_submit():
+        raise HTTPException(status_code=400, detail="Submissions no longer accepted")
+
+    # Extract words and validate against the puzzle's known answers
+    scored_words: list[tuple[str, int]] = []
+    for i, req_path in enumerate(req.paths):
+        path = [VersusGamePoint(x=point.x, y=point.y) for point in req_path]
+        word = extract_word(solved.puzzle.grid, path)
+        if word is None:
+            raise HTTPException(status_code=400, detail=f"Path {i} invalid")
+        if word not in solved.solutions:
+            raise HTTPException(status_code=400, detail=f"Path {i} is not a word")
+        scored_words.append((word, solved.puzzle.mode.word_points(word)))
+
+    await seeded_puzzle_repository.update_seeded_puzzle_result_submit_words(
+        seed, session_id, scored_words
+    )
+
+
+@app.post(
+    "/puzzle/{seed}/done",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def puzzle_set_player_done(
+    seed: str,
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+) -> None:
+    await get_solved_puzzle(seed)
+    await repositories.seeded_puzzle.update_seeded_puzzle_result_done(seed, session_id)
+
+
+class PuzzleLeaderboardEntry(BaseModel):
+    rank: int
+    points: int
+    is_this_player: bool
+
+
+class GetPuzzleLeaderboardResp(BaseModel):
+    entries: list[PuzzleLeaderboardEntry]
+
+
+@app.get(
+    "/puzzle/{seed}/leaderboard",
+    dependencies=[Depends(require_dictionary), Depends(rate_limit(GAME_RATE_LIMITER))],
+)
+async def get_puzzle_leaderboard(
+    seed: str,
+    session_id: Annotated[UUID, Depends(get_session_id)],
+    repositories: Annotated[Repositories, Depends(get_repositories)],
+    limit: Annotated[int, Query(ge=1, le=LEADERBOARD_MAX_LIMIT)] = 10,
+) -> GetPuzzleLeaderboardResp:
+    solved = await get_solved_puzzle(seed)
+    entries = await repositories.seeded_puzzle.list_seeded_puzzle_leaderboard(
+        solved.puzzle, limit
+    )
+    # Session ids authenticate their players, never show anyone else's
+    return GetPuzzleLeaderboardResp(
+        entries=[
+            PuzzleLeaderboardEntry(
+                rank=entry.rank,
+                points=entry.points,
+                is_this_player=entry.session_id == session_id,
+            )
+            for entry in entries
+        ]
+    )
@@ -0,0 +1,5 @@
+BEGIN;
+
+ALTER TABLE versus_games DROP COLUMN IF EXISTS version;
+
+COMMIT;
@@ -0,0 +1,5 @@
+BEGIN;
+
+ALTER TABLE versus_games ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+
+COMMIT;
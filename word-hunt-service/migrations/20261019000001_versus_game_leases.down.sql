@@ -0,0 +1,5 @@
+BEGIN;
+
+DROP TABLE IF EXISTS versus_game_leases;
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS versus_game_leases(
+    game_id UUID PRIMARY KEY REFERENCES versus_games(id) ON DELETE CASCADE,
+    owner_replica_id VARCHAR NOT NULL,
+    expires_at TIMESTAMP NOT NULL
+);
+
+COMMIT;
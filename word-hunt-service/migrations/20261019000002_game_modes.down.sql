@@ -0,0 +1,7 @@
+BEGIN;
+
+ALTER TABLE versus_games_match_queue DROP COLUMN IF EXISTS mode;
+
+ALTER TABLE versus_games DROP COLUMN IF EXISTS mode;
+
+COMMIT;
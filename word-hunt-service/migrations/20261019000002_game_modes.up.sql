@@ -0,0 +1,7 @@
+BEGIN;
+
+ALTER TABLE versus_games ADD COLUMN mode VARCHAR NOT NULL DEFAULT 'classic';
+
+ALTER TABLE versus_games_match_queue ADD COLUMN mode VARCHAR NOT NULL DEFAULT 'classic';
+
+COMMIT;
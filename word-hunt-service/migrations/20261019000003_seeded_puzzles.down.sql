@@ -0,0 +1,9 @@
+BEGIN;
+
+DROP TABLE IF EXISTS seeded_puzzle_submitted_words;
+
+DROP TABLE IF EXISTS seeded_puzzle_results;
+
+DROP TABLE IF EXISTS seeded_puzzles;
+
+COMMIT;
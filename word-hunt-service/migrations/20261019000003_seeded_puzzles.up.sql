@@ -0,0 +1,30 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS seeded_puzzles(
+    seed VARCHAR PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    mode VARCHAR NOT NULL,
+    grid JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seeded_puzzle_results(
+    seed VARCHAR NOT NULL REFERENCES seeded_puzzles(seed) ON DELETE CASCADE,
+    session_id UUID NOT NULL,
+    start TIMESTAMP NOT NULL DEFAULT NOW(),
+    done BOOLEAN NOT NULL DEFAULT FALSE,
+    points INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (seed, session_id)
+);
+
+CREATE INDEX seeded_puzzle_results_seed_points ON seeded_puzzle_results (seed, points DESC, start ASC);
+
+CREATE TABLE IF NOT EXISTS seeded_puzzle_submitted_words(
+    seed VARCHAR NOT NULL,
+    session_id UUID NOT NULL,
+    word VARCHAR NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (seed, session_id, word),
+    FOREIGN KEY (seed, session_id) REFERENCES seeded_puzzle_results(seed, session_id) ON DELETE CASCADE
+);
+
+COMMIT;
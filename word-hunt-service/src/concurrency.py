@@ -0,0 +1,101 @@
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from src.utils import LRUCache
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """Coalesce concurrent calls for the same key into a single in-flight call.
+
+    The call runs as its own task, so one caller being cancelled (e.g. by its client
+    disconnecting) doesn't cancel it for the others.
+    """
+
+    _flights: dict[K, asyncio.Task[T]]
+
+    def __init__(self) -> None:
+        self._flights = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn`, or join the call already in flight for this key."""
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(task)
+
+    def forget(self, key: K) -> None:
+        """Stop later calls for this key from joining the call now in flight, e.g.
+        because it may have read state from before a write.
+        """
+        self._flights.pop(key, None)
+
+    def _land(self, key: K, task: asyncio.Task[T]) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+
+@dataclass
+class _TokenBucket:
+    tokens: float
+    updated_at: float
+
+
+class SessionRateLimiter:
+    """A token bucket per session.
+
+    Buckets live in this process, so with `processes` sharing the load (e.g. a server's
+    workers) each enforces its share of the rate and burst. A session spreading its
+    requests over every process then gets about the given limits in total, though one
+    sticking to a single process gets less. The burst is at least 1 per process.
+
+    Only the most recently seen sessions are tracked, so memory stays bounded. A
+    forgotten session starts over with a full bucket.
+    """
+
+    name: str
+    rate_per_sec: float
+    burst: int
+    _buckets: LRUCache[UUID, _TokenBucket]
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float,
+        burst: int,
+        processes: int = 1,
+        max_sessions: int = 100_000,
+    ) -> None:
+        self.name = name
+        self.rate_per_sec = rate_per_sec / processes
+        self.burst = max(math.ceil(burst / processes), 1)
+        self._buckets = LRUCache(max_sessions)
+
+    def acquire(self, session_id: UUID) -> float:
+        """Take a token for the session. Returns 0 if taken, else secs until one is."""
+        now = time.monotonic()
+        bucket = self._buckets.get(session_id)
+        if bucket is None:
+            bucket = _TokenBucket(tokens=self.burst, updated_at=now)
+            self._buckets.put(session_id, bucket)
+
+        bucket.tokens = min(
+            self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate_per_sec
+        )
+        bucket.updated_at = now
+        if bucket.tokens < 1:
+            return (1 - bucket.tokens) / self.rate_per_sec
+        bucket.tokens -= 1
+        return 0
@@ -0,0 +1,18 @@
+LEASE_TTL_SECS = 30
+"""How long a replica owns a game for, unless it renews."""
+
+LEASE_RENEW_SECS = LEASE_TTL_SECS / 2
+"""Renew a held lease once it has less than this long left."""
+
+FORWARDED_HEADER = "x-forwarded-by-replica"
+"""Added by each replica a request is forwarded on by, naming it."""
+
+MAX_FORWARD_HOPS = 2
+"""Handle a request wherever it lands after this many forwards, in case replicas still
+disagree on its owner."""
+
+OWNER_HEADER = "x-game-owner"
+"""Names the replica that handled a game request, for sticky routing upstream."""
+
+FORWARD_TIMEOUT_SECS = 60
+"""Longer than any request we serve, so forwarding never cuts one short."""
@@ -0,0 +1,10 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class VersusGameLease(BaseModel):
+    game_id: UUID
+    owner_replica_id: str
+    expires_at: datetime
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from src.game_ownership import data_models
+from src.game_ownership.constants import LEASE_TTL_SECS
+from src.game_ownership.repository import GameLeaseRepository
+from src.versus_game.memory_repository import InMemoryVersusGameStore
+
+
+class InMemoryGameLeaseRepository(GameLeaseRepository):
+    """Game leases in process memory, stored alongside the games they lease.
+
+    See `InMemoryRepositoryBackend`.
+    """
+
+    _leases: dict[UUID, data_models.VersusGameLease]
+    _versus_game_store: InMemoryVersusGameStore
+
+    def __init__(
+        self,
+        leases: dict[UUID, data_models.VersusGameLease],
+        versus_game_store: InMemoryVersusGameStore,
+    ) -> None:
+        self._leases = leases
+        self._versus_game_store = versus_game_store
+
+    async def acquire_lease(self, game_id: UUID, replica_id: str) -> str | None:
+        if game_id not in self._versus_game_store.games:
+            self._leases.pop(game_id, None)
+            return None
+        now = datetime.now()
+        lease = self._leases.get(game_id)
+        if (
+            lease is None
+            or lease.owner_replica_id == replica_id
+            or lease.expires_at < now
+        ):
+            lease = data_models.VersusGameLease(
+                game_id=game_id,
+                owner_replica_id=replica_id,
+                expires_at=now + timedelta(seconds=LEASE_TTL_SECS),
+            )
+            self._leases[game_id] = lease
+        return lease.owner_replica_id
+
+    async def get_lease_holder(self, game_id: UUID) -> str | None:
+        lease = self._leases.get(game_id)
+        if lease is None or lease.expires_at < datetime.now():
+            return None
+        return lease.owner_replica_id
@@ -0,0 +1,121 @@
+import re
+from uuid import UUID
+
+import httpx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.game_ownership.constants import (
+    FORWARDED_HEADER,
+    MAX_FORWARD_HOPS,
+    OWNER_HEADER,
+)
+from src.game_ownership.router import HOP_BY_HOP_HEADERS, GameOwnershipRouter
+from src.instrumentation.metrics import GAME_REQUESTS_FORWARDED
+from src.instrumentation.middleware import FORWARDED_SCOPE_KEY
+
+GAME_PATH = re.compile(r"^/game/(?P<game_id>[0-9a-fA-F-]{36})(?:/|$)")
+
+
+class GameOwnershipMiddleware:
+    """Handle game requests on the replica owning the game, forwarding them if need be.
+
+    Responses name the owner in `OWNER_HEADER`, so an upstream proxy may route
+    straight to it next time. If the owner can't be reached, the request is handled
+    here instead, since the DB is still the source of truth.
+    """
+
+    _app: ASGIApp
+    _router: GameOwnershipRouter
+
+    def __init__(self, app: ASGIApp, router: GameOwnershipRouter) -> None:
+        self._app = app
+        self._router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        match = GAME_PATH.match(scope["path"])
+        if match is None:
+            await self._app(scope, receive, send)
+            return
+
+        # A forwarded request was routed by the sender's cached view of the lease, so
+        # check afresh rather than trust it. Still stop after a few hops, to avoid loops
+        hops = sum(1 for key, _ in scope["headers"] if key == FORWARDED_HEADER.encode())
+        owner = await self._router.owner(UUID(match["game_id"]), refresh=hops > 0)
+        if owner == self._router.replica_id or hops >= MAX_FORWARD_HOPS:
+            await self._handle_locally(scope, receive, send)
+            return
+
+        # Buffer the body, so we can still handle locally if forwarding fails
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        path_and_query = scope["path"]
+        if scope["query_string"]:
+            path_and_query += "?" + scope["query_string"].decode()
+        try:
+            resp = await self._router.forward(
+                owner, scope["method"], path_and_query, scope["headers"], body
+            )
+        except httpx.TransportError:
+            await self._handle_locally(scope, self._replay(body, receive), send)
+            return
+        GAME_REQUESTS_FORWARDED.inc(owner=owner)
+        scope[FORWARDED_SCOPE_KEY] = owner
+        await self._relay(resp, send)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        """Build a receive giving the already-read body, then deferring to `receive`."""
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay_receive
+
+    async def _handle_locally(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (OWNER_HEADER.encode(), self._router.replica_id.encode()),
+                ]
+            await send(message)
+
+        await self._app(scope, receive, send_wrapper)
+
+    @staticmethod
+    async def _relay(resp: httpx.Response, send: Send) -> None:
+        """Send a forwarded request's response back as our own."""
+        try:
+            # Relay the raw bytes, so encodings and lengths stay as the owner set them
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": resp.status_code,
+                    "headers": [
+                        (key, val)
+                        for key, val in resp.headers.raw
+                        if key.decode().lower() not in HOP_BY_HOP_HEADERS
+                    ],
+                }
+            )
+            async for chunk in resp.aiter_raw():
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await resp.aclose()
@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from psycopg import AsyncConnection
+from psycopg.errors import ForeignKeyViolation
+from psycopg.rows import class_row
+
+from src.game_ownership import data_models
+from src.game_ownership.constants import LEASE_TTL_SECS
+from src.instrumentation.metrics import timed_query
+
+
+class GameLeaseRepository(ABC):
+    """Leases granting a single replica ownership of a game."""
+
+    @abstractmethod
+    async def acquire_lease(self, game_id: UUID, replica_id: str) -> str | None:
+        """Take or renew the game's lease for the given replica, unless another
+        replica holds it unexpired.
+
+        Returns the id of the replica holding the lease afterwards, or None if there's
+        no such game.
+        """
+
+    @abstractmethod
+    async def get_lease_holder(self, game_id: UUID) -> str | None:
+        """Get the id of the replica holding the game's lease, if it's unexpired."""
+
+
+class PostgresGameLeaseRepository(GameLeaseRepository):
+    _db_conn: AsyncConnection
+
+    def __init__(self, db_conn: AsyncConnection) -> None:
+        self._db_conn = db_conn
+
+    async def acquire_lease(self, game_id: UUID, replica_id: str) -> str | None:
+        try:
+            lease = await self._db_game_lease_upsert(game_id, replica_id)
+        except ForeignKeyViolation:
+            return None
+        if lease is None:
+            lease = await self._db_game_lease_get(game_id)
+        return None if lease is None else lease.owner_replica_id
+
+    @timed_query
+    async def get_lease_holder(self, game_id: UUID) -> str | None:
+        async with self._db_conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT owner_replica_id FROM versus_game_leases
+                WHERE game_id = %s AND expires_at >= NOW()
+                """,
+                (game_id,),
+            )
+            result = await cur.fetchone()
+            return None if result is None else result[0]
+
+    @timed_query
+    async def _db_game_lease_upsert(
+        self, game_id: UUID, replica_id: str
+    ) -> data_models.VersusGameLease | None:
+        """Insert or renew the lease, if it's ours or expired. Returns it if so."""
+
+        query = """
+        INSERT INTO versus_game_leases (game_id, owner_replica_id, expires_at)
+        VALUES (%s, %s, NOW() + make_interval(secs => %s))
+        ON CONFLICT (game_id) DO UPDATE
+        SET
+            owner_replica_id = EXCLUDED.owner_replica_id,
+            expires_at = EXCLUDED.expires_at
+        WHERE versus_game_leases.owner_replica_id = EXCLUDED.owner_replica_id
+            OR versus_game_leases.expires_at < NOW()
+        RETURNING *
+        """
+        async with self._db_conn.cursor(
+            row_factory=class_row(data_models.VersusGameLease)
+        ) as cur:
+            await cur.execute(query, (game_id, replica_id, LEASE_TTL_SECS))
+            return await cur.fetchone()
+
+    @timed_query
+    async def _db_game_lease_get(
+        self, game_id: UUID
+    ) -> data_models.VersusGameLease | None:
+        async with self._db_conn.cursor(
+            row_factory=class_row(data_models.VersusGameLease)
+        ) as cur:
+            await cur.execute(
+                "SELECT * FROM versus_game_leases WHERE game_id = %s", (game_id,)
+            )
+            return await cur.fetchone()
@@ -0,0 +1,33 @@
+import bisect
+import hashlib
+
+
+class HashRing:
+    """A consistent hash ring over replica ids.
+
+    Each replica is placed on the ring many times, which evens out how many keys each
+    owns. Adding or removing a replica only moves the keys it gains or loses.
+    """
+
+    _points: list[int]
+    _replica_ids: list[str]
+
+    def __init__(self, replica_ids: list[str], vnodes: int = 64) -> None:
+        if not replica_ids:
+            raise ValueError("A hash ring needs at least one replica")
+        placed = sorted(
+            (self._hash(f"{replica_id}#{i}"), replica_id)
+            for replica_id in replica_ids
+            for i in range(vnodes)
+        )
+        self._points = [point for point, _ in placed]
+        self._replica_ids = [replica_id for _, replica_id in placed]
+
+    def owner(self, key: str) -> str:
+        """Get the replica id owning the given key."""
+        ind = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._replica_ids[ind]
+
+    @staticmethod
+    def _hash(val: str) -> int:
+        return int.from_bytes(hashlib.sha256(val.encode()).digest()[:8], "big")
@@ -0,0 +1,161 @@
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import UUID, uuid4
+
+import httpx
+
+from src.game_ownership.constants import (
+    FORWARD_TIMEOUT_SECS,
+    FORWARDED_HEADER,
+    LEASE_RENEW_SECS,
+    LEASE_TTL_SECS,
+)
+from src.game_ownership.ring import HashRing
+from src.repositories import RepositoryBackend
+from src.utils import LRUCache
+
+HOP_BY_HOP_HEADERS = {"connection", "host", "keep-alive", "transfer-encoding"}
+"""Headers describing a single hop, which mustn't be copied onto the next one."""
+
+
+class GameOwnershipRouter:
+    """Decides which replica owns each game, and forwards requests to it.
+
+    Ownership follows a consistent hash of the game id over every replica, so replicas
+    agree on it without coordinating. The owner also holds a lease on the game in the
+    DB, which wins over the ring while membership changes (e.g. during a rollout), so
+    that two replicas never both treat a game as theirs.
+    """
+
+    replica_id: str
+    _replica_urls: dict[str, str]
+    _ring: HashRing
+    _lease_holders: LRUCache[UUID, tuple[str, float]]
+    _backend: RepositoryBackend | None
+    _client: httpx.AsyncClient | None
+
+    def __init__(
+        self,
+        replica_id: str,
+        replica_urls: dict[str, str],
+        max_leases: int = 100_000,
+    ) -> None:
+        if replica_id not in replica_urls:
+            raise ValueError(f"Replica {replica_id} missing from its own replica list")
+        self.replica_id = replica_id
+        self._replica_urls = replica_urls
+        self._ring = HashRing(list(replica_urls))
+        self._lease_holders = LRUCache(max_leases)
+        self._backend = None
+        self._client = None
+
+    @asynccontextmanager
+    async def running(self, backend: RepositoryBackend) -> AsyncIterator[None]:
+        """Route using the given backend's leases, for as long as the context lasts."""
+        async with httpx.AsyncClient(timeout=FORWARD_TIMEOUT_SECS) as client:
+            self._backend = backend
+            self._client = client
+            try:
+                yield
+            finally:
+                self._backend = None
+                self._client = None
+
+    async def owner(self, game_id: UUID, refresh: bool = False) -> str:
+        """Get the id of the replica which should handle requests for the game.
+
+        Every replica defers to an unexpired lease, wherever it's held. Leases are
+        cached for a while unless `refresh`, e.g. for a request another replica
+        already routed by its own cache.
+        """
+        now = time.monotonic()
+        cached = None if refresh else self._lease_holders.get(game_id)
+        if cached is not None and cached[1] > now:
+            holder = cached[0]
+        else:
+            holder = await self._check_lease(game_id)
+            if holder is not None:
+                # Renew our own lease well before it runs out
+                recheck_secs = (
+                    LEASE_TTL_SECS - LEASE_RENEW_SECS
+                    if holder == self.replica_id
+                    else LEASE_RENEW_SECS
+                )
+                self._lease_holders.put(game_id, (holder, now + recheck_secs))
+
+        # Unknown games 404 wherever they land, as do games leased by a stranger
+        if holder is None or holder not in self._replica_urls:
+            return self.replica_id
+        return holder
+
+    def new_owned_game_id(self) -> UUID:
+        """Draw a new game id that this replica owns on the ring, for games it plays in
+        itself (e.g. as a bot), so its writes go through the same process as requests.
+        """
+        while True:
+            game_id = uuid4()
+            if self._ring.owner(str(game_id)) == self.replica_id:
+                return game_id
+
+    async def _check_lease(self, game_id: UUID) -> str | None:
+        """Get who holds the game's lease, taking or renewing it if it's ours to hold.
+
+        Only the game's ring owner takes a free lease. Anyone else sends the game to
+        the ring owner until it has.
+        """
+        if self._backend is None:
+            raise ValueError("Cannot access repository backend")
+        ring_owner = self._ring.owner(str(game_id))
+        async with self._backend.repositories() as repositories:
+            game_lease_repository = repositories.game_lease
+            if ring_owner == self.replica_id:
+                return await game_lease_repository.acquire_lease(
+                    game_id, self.replica_id
+                )
+            holder = await game_lease_repository.get_lease_holder(game_id)
+            if holder is None:
+                return ring_owner
+            if holder == self.replica_id:
+                return await game_lease_repository.acquire_lease(
+                    game_id, self.replica_id
+                )
+            return holder
+
+    async def forward(
+        self,
+        owner: str,
+        method: str,
+        path_and_query: str,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> httpx.Response:
+        """Send a request on to its owner, returning the unread, streamed response.
+
+        The caller must close the response.
+        """
+        if self._client is None:
+            raise ValueError("Cannot forward before router is running")
+        request = self._client.build_request(
+            method,
+            self._replica_urls[owner] + path_and_query,
+            headers=[
+                (key, val)
+                for key, val in headers
+                if key.decode().lower() not in HOP_BY_HOP_HEADERS
+            ]
+            + [(FORWARDED_HEADER.encode(), self.replica_id.encode())],
+            content=body,
+        )
+        return await self._client.send(request, stream=True)
+
+
+def parse_replica_urls(replicas: str) -> dict[str, str]:
+    """Parse `id=url,id=url` into a map of replica id to base url."""
+    out: dict[str, str] = {}
+    for entry in replicas.split(","):
+        replica_id, sep, url = entry.strip().partition("=")
+        if not sep:
+            raise ValueError(f"Expected 'id=url', got {entry!r}")
+        out[replica_id] = url.rstrip("/")
+    return out
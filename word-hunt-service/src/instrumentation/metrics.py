@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""Histogram bucket upper bounds in seconds, from a fast query up to a long poll."""
+
+SNAPSHOT_INTERVAL_SECS = 5.0
+"""How often each process writes its metrics snapshot for the others to sum in."""
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{val}"' for key, val in labels)
+    return "{" + inner + "}"
+
+
+class Counter:
+    """A monotonically increasing count, per label set."""
+
+    name: str
+    help: str
+    _values: dict[Labels, float]
+
+    def __init__(self, name: str, help: str) -> None:  # noqa: A002
+        self.name = name
+        self.help = help
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def empty(self) -> Counter:
+        return Counter(self.name, self.help)
+
+    def dump(self) -> list[Any]:
+        """The counts as JSON, for `load()` in another process."""
+        return [[dict(labels), value] for labels, value in self._values.items()]
+
+    def load(self, dumped: list[Any]) -> None:
+        """Add in counts from `dump()`."""
+        for labels, value in dumped:
+            self.inc(value, **labels)
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        out.extend(
+            f"{self.name}{_format_labels(labels)} {value}"
+            for labels, value in sorted(self._values.items())
+        )
+        return out
+
+
+class Histogram:
+    """A distribution of observed values, bucketed, per label set."""
+
+    name: str
+    help: str
+    buckets: tuple[float, ...]
+    _counts: dict[Labels, list[int]]
+    _sums: dict[Labels, float]
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._counts = {}
+        self._sums = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        counts = self._counts.get(key)
+        if counts is None:
+            # One extra slot for +Inf
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def empty(self) -> Histogram:
+        return Histogram(self.name, self.help, self.buckets)
+
+    def dump(self) -> list[Any]:
+        """The observations as JSON, for `load()` in another process."""
+        return [
+            [dict(labels), counts, self._sums[labels]]
+            for labels, counts in self._counts.items()
+        ]
+
+    def load(self, dumped: list[Any]) -> None:
+        """Add in observations from `dump()`, which must share our buckets."""
+        for labels, counts, total in dumped:
+            key = tuple(sorted(labels.items()))
+            own = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for ind, count in enumerate(counts):
+                own[ind] += count
+            self._sums[key] = self._sums.get(key, 0) + total
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(
+                [*map(str, self.buckets), "+Inf"], counts, strict=True
+            ):
+                cumulative += count
+                bucket_labels = (*labels, ("le", bound))
+                out.append(
+                    f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                )
+            out.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[labels]}")
+            out.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return out
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request, by route."
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Time spent in a query, by repository method."
+)
+
+POLL_ITERATIONS = Counter(
+    "poll_iterations_total", "Iterations of the matchmaking polling loops, by loop."
+)
+
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total", "Requests rejected by a per-session rate limiter."
+)
+
+GAME_REQUESTS_FORWARDED = Counter(
+    "game_requests_forwarded_total", "Game requests forwarded to their owner replica."
+)
+
+SUBMITTED_WORDS_BATCH_SIZE = Histogram(
+    "submitted_words_batch_size",
+    "Submitted words written per write-behind flush.",
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+
+SUBMITTED_WORDS_DROPPED = Counter(
+    "submitted_words_dropped_total",
+    "Accepted words the write-behind failed to write, even retrying.",
+)
+
+REGISTRY: list[Counter | Histogram] = [
+    HTTP_REQUEST_DURATION,
+    DB_QUERY_DURATION,
+    POLL_ITERATIONS,
+    RATE_LIMITED,
+    GAME_REQUESTS_FORWARDED,
+    SUBMITTED_WORDS_BATCH_SIZE,
+    SUBMITTED_WORDS_DROPPED,
+]
+"""Every metric exported from `/metrics`."""
+
+
+RETIRED_SNAPSHOT = "retired.json"
+"""Sums the last snapshots of every exited process, see `retire_metrics_snapshot()`."""
+
+_snapshot_name: tuple[int, str] | None = None
+"""This process' snapshot file name, with the pid it was named for."""
+
+
+def _process_snapshot_name() -> str:
+    """Name this process' snapshot by pid and start, so a reused pid can't overwrite an
+    exited process' snapshot.
+
+    Named lazily, since processes forked after import (e.g. preloaded workers) would
+    all inherit one name from import time.
+    """
+    global _snapshot_name  # noqa: PLW0603
+    if _snapshot_name is None or _snapshot_name[0] != os.getpid():
+        _snapshot_name = (os.getpid(), f"{os.getpid()}-{time.time_ns()}.json")
+    return _snapshot_name[1]
+
+
+def _write_json(path: Path, data: object) -> None:
+    # Replace atomically, so readers never see a partial file
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+def _dump_registry(registry: list[Counter | Histogram]) -> dict[str, list[Any]]:
+    return {metric.name: metric.dump() for metric in registry}
+
+
+def _load_registry(dumps: list[dict[str, list[Any]]]) -> list[Counter | Histogram]:
+    """Sum dumps from `_dump_registry()` into fresh copies of every metric."""
+    registry = [metric.empty() for metric in REGISTRY]
+    by_name = {metric.name: metric for metric in registry}
+    for dumped_registry in dumps:
+        for name, dumped in dumped_registry.items():
+            if name in by_name:
+                by_name[name].load(dumped)
+    return registry
+
+
+def write_metrics_snapshot(snapshot_dir: Path) -> None:
+    """Write this process' metrics to the dir, for `render_metrics()` in any process
+    sharing it to sum in.
+    """
+    _write_json(snapshot_dir / _process_snapshot_name(), _dump_registry(REGISTRY))
+
+
+def retire_metrics_snapshot(snapshot_dir: Path, pid: int) -> None:
+    """Fold an exited process' snapshots into the retired one, so its counts are kept
+    without its files piling up.
+    """
+    retired_path = snapshot_dir / RETIRED_SNAPSHOT
+    retired = (
+        json.loads(retired_path.read_text())
+        if retired_path.exists()
+        else {"folded": [], "metrics": {}}
+    )
+    paths = list(snapshot_dir.glob(f"{pid}-*.json"))
+    registry = _load_registry(
+        [retired["metrics"], *(json.loads(path.read_text()) for path in paths)]
+    )
+    # Name the folded files in the retired snapshot before removing them, so readers
+    # never count one twice
+    _write_json(
+        retired_path,
+        {
+            "folded": [*retired["folded"], *(path.name for path in paths)],
+            "metrics": _dump_registry(registry),
+        },
+    )
+    for path in paths:
+        path.unlink()
+
+
+def render_metrics(snapshot_dir: Path | None = None) -> str:
+    """Render every registered metric in the Prometheus text exposition format.
+
+    Given a snapshot dir, render the sums over every process' latest snapshot instead,
+    e.g. across a server's workers, exited ones included. Other processes' counts lag
+    by up to `SNAPSHOT_INTERVAL_SECS`.
+    """
+    registry = REGISTRY
+    if snapshot_dir is not None:
+        write_metrics_snapshot(snapshot_dir)
+
+        # Read the live snapshots before the retired one, so any that were folded in
+        # meanwhile are named in it
+        live: dict[str, dict[str, list[Any]]] = {}
+        for path in snapshot_dir.glob("*-*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                live[path.name] = json.loads(path.read_text())
+        retired_path = snapshot_dir / RETIRED_SNAPSHOT
+        dumps = list(live.values())
+        if retired_path.exists():
+            retired = json.loads(retired_path.read_text())
+            folded = set(retired["folded"])
+            dumps = [dumped for name, dumped in live.items() if name not in folded]
+            dumps.append(retired["metrics"])
+        registry = _load_registry(dumps)
+    lines = [line for metric in registry for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+def timed_query(
+    func: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """Record how long a repository method spends in the DB, keyed by its name."""
+    method = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - start, method=method)
+
+    return wrapper
@@ -0,0 +1,55 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.instrumentation.metrics import HTTP_REQUEST_DURATION
+
+FORWARDED_SCOPE_KEY = "forwarded_to_replica"
+"""Set on the scope of a request forwarded on rather than routed here, see
+`GameOwnershipMiddleware`."""
+
+
+class RouteTimingMiddleware:
+    """Time every HTTP request, labelled by its route template rather than raw path.
+
+    Labelling by template (`/game/{game_id}`) keeps one series per route instead of one
+    per game. Requests forwarded to another replica never reach the router here, so
+    they're labelled `forwarded`.
+    """
+
+    _app: ASGIApp
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self._app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the scope once it's resolved
+            route = scope.get("route")
+            if route is not None:
+                route_label = route.path
+            elif FORWARDED_SCOPE_KEY in scope:
+                route_label = "forwarded"
+            else:
+                route_label = "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route_label,
+                status=str(status_code),
+            )
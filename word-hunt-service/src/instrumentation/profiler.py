@@ -0,0 +1,72 @@
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+MAX_STACK_DEPTH = 64
+"""Frames beyond this depth are cut from samples, to keep collection cheap."""
+
+MAX_PROFILE_SECS = 300
+"""The longest a single profile request may sample for."""
+
+
+class SamplingProfiler:
+    """Periodically samples one thread's stack from a background thread.
+
+    Samples are aggregated as collapsed stacks (`outer;inner count` per line), which
+    flamegraph.pl and speedscope both read. Toggle it on a live process to find hot
+    spots without redeploying; while stopped it costs nothing.
+    """
+
+    interval_secs: float
+    _samples: Counter[str]
+    _stop: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, interval_secs: float = 0.005) -> None:
+        self.interval_secs = interval_secs
+        self._samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, thread_id: int) -> None:
+        """Start sampling the given thread, discarding any previous samples."""
+        if self._thread is not None:
+            return
+        self._samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, args=(thread_id,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling, return the collapsed stacks collected."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self._samples.most_common()
+        )
+
+    def _sample_loop(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval_secs):
+            frame = sys._current_frames().get(thread_id)  # noqa: SLF001
+            if frame is not None:
+                self._samples[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> str:
+        """Render a stack root-first, as `file:function` entries joined by `;`."""
+        names: list[str] = []
+        cur: FrameType | None = frame
+        while cur is not None and len(names) < MAX_STACK_DEPTH:
+            code = cur.f_code
+            names.append(f"{code.co_filename}:{code.co_name}")
+            cur = cur.f_back
+        return ";".join(reversed(names))
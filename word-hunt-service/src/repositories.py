@@ -0,0 +1,106 @@
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from typing import Protocol
+from uuid import UUID
+
+from psycopg_pool import AsyncConnectionPool
+
+from src.game_ownership.data_models import VersusGameLease
+from src.game_ownership.memory_repository import InMemoryGameLeaseRepository
+from src.game_ownership.repository import (
+    GameLeaseRepository,
+    PostgresGameLeaseRepository,
+)
+from src.seeded_puzzle.memory_repository import (
+    InMemorySeededPuzzleRepository,
+    InMemorySeededPuzzleStore,
+)
+from src.seeded_puzzle.repository import (
+    PostgresSeededPuzzleRepository,
+    SeededPuzzleRepository,
+)
+from src.versus_game.memory_repository import (
+    InMemoryVersusGameRepository,
+    InMemoryVersusGameStore,
+)
+from src.versus_game.repository import (
+    PostgresVersusGameRepository,
+    VersusGameRepository,
+)
+from src.versus_match_queue.memory_repository import (
+    InMemoryVersusMatchQueueRepository,
+    InMemoryVersusMatchQueueStore,
+)
+from src.versus_match_queue.repository import (
+    PostgresVersusMatchQueueRepository,
+    VersusMatchQueueRepository,
+)
+
+
+@dataclass(frozen=True)
+class Repositories:
+    """Every repository, sharing one unit of storage access (e.g. a connection)."""
+
+    versus_game: VersusGameRepository
+    versus_match_queue: VersusMatchQueueRepository
+    game_lease: GameLeaseRepository
+    seeded_puzzle: SeededPuzzleRepository
+
+
+class RepositoryBackend(Protocol):
+    def repositories(self) -> AbstractAsyncContextManager[Repositories]:
+        """Borrow a set of repositories, for as long as the context is entered."""
+        ...
+
+
+class PostgresRepositoryBackend:
+    """Repositories over a pooled Postgres connection."""
+
+    _pool: AsyncConnectionPool
+
+    def __init__(self, pool: AsyncConnectionPool) -> None:
+        self._pool = pool
+
+    @asynccontextmanager
+    async def repositories(self) -> AsyncIterator[Repositories]:
+        async with self._pool.connection() as db_conn:
+            yield Repositories(
+                versus_game=PostgresVersusGameRepository(db_conn),
+                versus_match_queue=PostgresVersusMatchQueueRepository(db_conn),
+                game_lease=PostgresGameLeaseRepository(db_conn),
+                seeded_puzzle=PostgresSeededPuzzleRepository(db_conn),
+            )
+
+
+class InMemoryRepositoryBackend:
+    """Repositories over process memory, with nothing to borrow or wait on.
+
+    For benchmarks and single-process deployments, since only this process can see
+    them. No repository method awaits partway through, so each runs atomically on the
+    event loop.
+    """
+
+    _versus_game_store: InMemoryVersusGameStore
+    _versus_match_queue_store: InMemoryVersusMatchQueueStore
+    _game_leases: dict[UUID, VersusGameLease]
+    _seeded_puzzle_store: InMemorySeededPuzzleStore
+
+    def __init__(self) -> None:
+        self._versus_game_store = InMemoryVersusGameStore()
+        self._versus_match_queue_store = InMemoryVersusMatchQueueStore()
+        self._game_leases = {}
+        self._seeded_puzzle_store = InMemorySeededPuzzleStore()
+
+    @asynccontextmanager
+    async def repositories(self) -> AsyncIterator[Repositories]:
+        yield Repositories(
+            versus_game=InMemoryVersusGameRepository(self._versus_game_store),
+            versus_match_queue=InMemoryVersusMatchQueueRepository(
+                self._versus_match_queue_store
+            ),
+            game_lease=InMemoryGameLeaseRepository(
+                self._game_leases, self._versus_game_store
+            ),
+            seeded_puzzle=InMemorySeededPuzzleRepository(self._seeded_puzzle_store),
+        )
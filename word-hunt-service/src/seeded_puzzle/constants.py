@@ -0,0 +1,8 @@
+DAILY_PUZZLE_MODE = "classic"
+"""The game mode the daily puzzle is played by."""
+
+SOLVED_PUZZLE_CACHE_SIZE = 64
+"""How many solved puzzles to keep in memory. Each holds its board's every answer."""
+
+LEADERBOARD_MAX_LIMIT = 100
+"""The most leaderboard entries a single request may list."""
@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+Grid = list[list[str | None]]
+
+
+class SeededPuzzle(BaseModel):
+    seed: str
+    created_at: datetime
+    mode: str
+    grid: Grid
+
+
+class SeededPuzzleResult(BaseModel):
+    seed: str
+    session_id: UUID
+    start: datetime
+    done: bool
+    points: int
+    words: list[str]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import cached_property
+from uuid import UUID
+
+from src import utils
+from src.versus_game.domain import GameMode, Grid, Point, random_template_and_grid
+from src.versus_game.letters import LetterSampler
+
+
+def daily_seed(day: date) -> str:
+    """The seed of the given day's daily puzzle."""
+    return f"daily-{day.isoformat()}"
+
+
+def seeded_grid(seed: str, mode: GameMode, letters: LetterSampler) -> Grid:
+    """Draw the grid for a seed, the same every time given the same mode and letters."""
+    return random_template_and_grid(mode, letters, random.Random(seed))  # noqa: S311
+
+
+@dataclass(frozen=True)
+class SeededPuzzle:
+    """A board shared by every player of a seed, each playing it solo."""
+
+    seed: str
+    mode: GameMode
+    grid: Grid
+
+
+@dataclass(frozen=True)
+class SolvedPuzzle:
+    """A seeded puzzle, with every answer its board holds."""
+
+    puzzle: SeededPuzzle
+    solutions: dict[str, list[Point]]
+
+    @cached_property
+    def max_points(self) -> int:
+        return sum(self.puzzle.mode.word_points(word) for word in self.solutions)
+
+
+@dataclass(frozen=True)
+class SeededPuzzleResult:
+    """A single player's play of a seeded puzzle."""
+
+    session_id: UUID
+    mode: GameMode
+    start: datetime
+    done: bool
+    points: int
+    words: list[str]
+
+    def play_secs_remaining(self) -> float:
+        """How many seconds this player has left, per their start time."""
+        if self.done:
+            return 0
+        return max(self.mode.duration_secs - utils.elapsed_secs(self.start), 0)
+
+    def may_submit(self) -> bool:
+        """Whether the player may submit again.
+
+        Like a versus game, submissions are accepted a while past the player's clock
+        running out, to allow for latency.
+        """
+        return (
+            not self.done and utils.elapsed_secs(self.start) < self.mode.auto_end_secs()
+        )
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    rank: int
+    """Players on equal points share a rank, e.g. 1, 2, 2, 4."""
+
+    session_id: UUID
+    points: int
@@ -0,0 +1,131 @@
+from datetime import datetime
+from uuid import UUID
+
+from src import utils
+from src.seeded_puzzle import data_models
+from src.seeded_puzzle.repository import SeededPuzzleRepository
+from src.versus_game.domain import GameModeName, Grid
+
+
+class InMemorySeededPuzzleStore:
+    """Seeded puzzles and their results held in process memory, shared by every
+    repository over it.
+    """
+
+    puzzles: dict[str, data_models.SeededPuzzle]
+    results: dict[tuple[str, UUID], data_models.SeededPuzzleResult]
+
+    def __init__(self) -> None:
+        self.puzzles = {}
+        self.results = {}
+
+
+class InMemorySeededPuzzleRepository(SeededPuzzleRepository):
+    """A seeded puzzle repository over an in-memory store, see
+    `InMemoryRepositoryBackend`.
+
+    Leaderboards sort every result, rather than keep an index.
+    """
+
+    _store: InMemorySeededPuzzleStore
+
+    def __init__(self, store: InMemorySeededPuzzleStore) -> None:
+        self._store = store
+
+    async def update_seeded_puzzle_result_start(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Start the given player on the puzzle, unless they already have."""
+        if seed not in self._store.puzzles:
+            raise ValueError(f"Puzzle {seed} does not exist")
+        self._store.results.setdefault(
+            (seed, session_id),
+            data_models.SeededPuzzleResult(
+                seed=seed,
+                session_id=session_id,
+                start=datetime.now(),
+                done=False,
+                points=0,
+                words=[],
+            ),
+        )
+
+    async def update_seeded_puzzle_result_submit_words(
+        self, seed: str, session_id: UUID, scored_words: list[tuple[str, int]]
+    ) -> None:
+        """Add validated words to a started player's result."""
+        result = self._store.results.get((seed, session_id))
+        if result is None:
+            return
+        words = list(result.words)
+        points = result.points
+        for word, word_points in scored_words:
+            if word not in words:
+                words.append(word)
+                points += word_points
+        self._store.results[seed, session_id] = result.model_copy(
+            update={"words": words, "points": points}
+        )
+
+    async def update_seeded_puzzle_result_done(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Set the given player to be done submitting words."""
+        result = self._store.results.get((seed, session_id))
+        if result is not None:
+            self._store.results[seed, session_id] = result.model_copy(
+                update={"done": True}
+            )
+
+    async def _db_seeded_puzzle_insert(
+        self, seed: str, mode_name: GameModeName, grid: Grid
+    ) -> None:
+        """Insert a puzzle, unless the seed already has one."""
+        self._store.puzzles.setdefault(
+            seed,
+            data_models.SeededPuzzle(
+                seed=seed, created_at=datetime.now(), mode=mode_name, grid=grid
+            ),
+        )
+
+    async def _db_seeded_puzzle_get(self, seed: str) -> data_models.SeededPuzzle | None:
+        """Get a seeded puzzle data model."""
+        return self._store.puzzles.get(seed)
+
+    async def _db_seeded_puzzle_result_get(
+        self, seed: str, session_id: UUID
+    ) -> data_models.SeededPuzzleResult | None:
+        """Get a player's result data model, with their submitted words."""
+        return self._store.results.get((seed, session_id))
+
+    async def _db_seeded_puzzle_results_top(
+        self, seed: str, finished_after_secs: float, limit: int
+    ) -> list[tuple[UUID, int]]:
+        """List the (session id, points) of the top finished results, best first."""
+        results = sorted(
+            (
+                result
+                for (result_seed, _), result in self._store.results.items()
+                if result_seed == seed and _finished(result, finished_after_secs)
+            ),
+            key=lambda result: (-result.points, result.start),
+        )
+        return [(result.session_id, result.points) for result in results[:limit]]
+
+    async def _db_seeded_puzzle_results_count_above(
+        self, seed: str, finished_after_secs: float, points: int
+    ) -> int:
+        """Count the finished results on a puzzle with more than the given points."""
+        return sum(
+            1
+            for (result_seed, _), result in self._store.results.items()
+            if result_seed == seed
+            and result.points > points
+            and _finished(result, finished_after_secs)
+        )
+
+
+def _finished(
+    result: data_models.SeededPuzzleResult, finished_after_secs: float
+) -> bool:
+    return result.done or utils.elapsed_secs(result.start) >= finished_after_secs
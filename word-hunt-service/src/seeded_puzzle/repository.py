@@ -0,0 +1,283 @@
+from abc import ABC, abstractmethod
+from typing import cast
+from uuid import UUID
+
+from psycopg import AsyncConnection
+from psycopg.rows import class_row
+from psycopg.types.json import Jsonb
+
+from src.instrumentation.metrics import timed_query
+from src.seeded_puzzle import data_models, domain
+from src.versus_game.domain import GAME_MODES, GameMode, GameModeName, Grid
+
+
+class SeededPuzzleRepository(ABC):
+    """Seeded puzzles, and every player's result on them.
+
+    Backends implement the `_db_*` primitives and the result updates.
+    """
+
+    async def create_or_get_seeded_puzzle(
+        self, seed: str, mode: GameMode, grid: Grid
+    ) -> domain.SeededPuzzle:
+        """Store a puzzle for the seed, unless one's already stored. Returns whichever
+        is stored, so every replica serves the same board even if their letter weights
+        differ.
+        """
+        await self._db_seeded_puzzle_insert(seed, mode.name, grid)
+        puzzle = await self.get_seeded_puzzle(seed)
+        if puzzle is None:
+            raise ValueError(f"Expected puzzle {seed} to exist after insert")
+        return puzzle
+
+    async def get_seeded_puzzle(self, seed: str) -> domain.SeededPuzzle | None:
+        """Get a stored puzzle."""
+        db_puzzle = await self._db_seeded_puzzle_get(seed)
+        if db_puzzle is None:
+            return None
+        return domain.SeededPuzzle(
+            seed=db_puzzle.seed,
+            mode=GAME_MODES[cast(GameModeName, db_puzzle.mode)],
+            grid=db_puzzle.grid,
+        )
+
+    async def get_seeded_puzzle_result(
+        self, puzzle: domain.SeededPuzzle, session_id: UUID
+    ) -> domain.SeededPuzzleResult | None:
+        """Get a player's result on a puzzle, if they've started it."""
+        db_result = await self._db_seeded_puzzle_result_get(puzzle.seed, session_id)
+        if db_result is None:
+            return None
+        return domain.SeededPuzzleResult(
+            session_id=db_result.session_id,
+            mode=puzzle.mode,
+            start=db_result.start,
+            done=db_result.done,
+            points=db_result.points,
+            words=db_result.words,
+        )
+
+    async def list_seeded_puzzle_leaderboard(
+        self, puzzle: domain.SeededPuzzle, limit: int
+    ) -> list[domain.LeaderboardEntry]:
+        """List the top finished results on a puzzle, ties going to whoever started
+        first.
+
+        Players still able to submit aren't listed until they finish, so ranks only
+        ever change by others finishing.
+        """
+        out: list[domain.LeaderboardEntry] = []
+        for ind, (session_id, points) in enumerate(
+            await self._db_seeded_puzzle_results_top(
+                puzzle.seed, puzzle.mode.auto_end_secs(), limit
+            )
+        ):
+            rank = out[-1].rank if out and out[-1].points == points else ind + 1
+            out.append(
+                domain.LeaderboardEntry(rank=rank, session_id=session_id, points=points)
+            )
+        return out
+
+    async def get_seeded_puzzle_rank(
+        self, puzzle: domain.SeededPuzzle, points: int
+    ) -> int:
+        """Get the rank a finished result with the given points holds on a puzzle."""
+        return (
+            await self._db_seeded_puzzle_results_count_above(
+                puzzle.seed, puzzle.mode.auto_end_secs(), points
+            )
+            + 1
+        )
+
+    @abstractmethod
+    async def update_seeded_puzzle_result_start(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Start the given player on the puzzle, unless they already have."""
+
+    @abstractmethod
+    async def update_seeded_puzzle_result_submit_words(
+        self, seed: str, session_id: UUID, scored_words: list[tuple[str, int]]
+    ) -> None:
+        """Given a set of _validated_ (word, points), add them to a started player's
+        result.
+
+        Words the player already submitted are ignored, and score nothing again.
+        """
+
+    @abstractmethod
+    async def update_seeded_puzzle_result_done(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Set the given player to be done submitting words."""
+
+    @abstractmethod
+    async def _db_seeded_puzzle_insert(
+        self, seed: str, mode_name: GameModeName, grid: Grid
+    ) -> None:
+        """Insert a puzzle, unless the seed already has one."""
+
+    @abstractmethod
+    async def _db_seeded_puzzle_get(self, seed: str) -> data_models.SeededPuzzle | None:
+        """Get a seeded puzzle data model."""
+
+    @abstractmethod
+    async def _db_seeded_puzzle_result_get(
+        self, seed: str, session_id: UUID
+    ) -> data_models.SeededPuzzleResult | None:
+        """Get a player's result data model, with their submitted words."""
+
+    @abstractmethod
+    async def _db_seeded_puzzle_results_top(
+        self, seed: str, finished_after_secs: float, limit: int
+    ) -> list[tuple[UUID, int]]:
+        """List the (session id, points) of the top finished results, best first.
+
+        A result is finished once done, or started at least `finished_after_secs` ago.
+        """
+
+    @abstractmethod
+    async def _db_seeded_puzzle_results_count_above(
+        self, seed: str, finished_after_secs: float, points: int
+    ) -> int:
+        """Count the finished results on a puzzle with more than the given points."""
+
+
+class PostgresSeededPuzzleRepository(SeededPuzzleRepository):
+    _db_conn: AsyncConnection
+
+    def __init__(self, db_conn: AsyncConnection) -> None:
+        self._db_conn = db_conn
+
+    @timed_query
+    async def update_seeded_puzzle_result_start(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Start the given player on the puzzle, unless they already have."""
+        query = """
+        INSERT INTO seeded_puzzle_results (seed, session_id)
+        VALUES (%s, %s)
+        ON CONFLICT DO NOTHING
+        """
+        await self._db_conn.execute(query, (seed, session_id))
+
+    @timed_query
+    async def update_seeded_puzzle_result_submit_words(
+        self, seed: str, session_id: UUID, scored_words: list[tuple[str, int]]
+    ) -> None:
+        """Add validated words to a started player's result."""
+
+        # Only words actually inserted add to the points, so resubmits score nothing
+        query = """
+        WITH inserted AS (
+            INSERT INTO seeded_puzzle_submitted_words (seed, session_id, word, points)
+            SELECT %s, %s, word, points
+            FROM unnest(%s::VARCHAR[], %s::INTEGER[]) AS submitted(word, points)
+            ON CONFLICT DO NOTHING
+            RETURNING points
+        )
+        UPDATE seeded_puzzle_results
+        SET points = points + (SELECT COALESCE(SUM(points), 0) FROM inserted)
+        WHERE seed = %s AND session_id = %s
+        """
+        await self._db_conn.execute(
+            query,
+            (
+                seed,
+                session_id,
+                [word for word, _ in scored_words],
+                [points for _, points in scored_words],
+                seed,
+                session_id,
+            ),
+        )
+
+    @timed_query
+    async def update_seeded_puzzle_result_done(
+        self, seed: str, session_id: UUID
+    ) -> None:
+        """Set the given player to be done submitting words."""
+        await self._db_conn.execute(
+            """
+            UPDATE seeded_puzzle_results SET done = TRUE
+            WHERE seed = %s AND session_id = %s
+            """,
+            (seed, session_id),
+        )
+
+    @timed_query
+    async def _db_seeded_puzzle_insert(
+        self, seed: str, mode_name: GameModeName, grid: Grid
+    ) -> None:
+        """Insert a puzzle, unless the seed already has one."""
+        query = """
+        INSERT INTO seeded_puzzles (seed, mode, grid)
+        VALUES (%s, %s, %s)
+        ON CONFLICT DO NOTHING
+        """
+        await self._db_conn.execute(query, (seed, mode_name, Jsonb(grid)))
+
+    @timed_query
+    async def _db_seeded_puzzle_get(self, seed: str) -> data_models.SeededPuzzle | None:
+        """Get a seeded puzzle data model."""
+        async with self._db_conn.cursor(
+            row_factory=class_row(data_models.SeededPuzzle)
+        ) as cur:
+            await cur.execute("SELECT * FROM seeded_puzzles WHERE seed = %s", (seed,))
+            return await cur.fetchone()
+
+    @timed_query
+    async def _db_seeded_puzzle_result_get(
+        self, seed: str, session_id: UUID
+    ) -> data_models.SeededPuzzleResult | None:
+        """Get a player's result data model, with their submitted words."""
+        query = """
+        SELECT
+            results.*,
+            ARRAY(
+                SELECT word FROM seeded_puzzle_submitted_words AS words
+                WHERE words.seed = results.seed
+                    AND words.session_id = results.session_id
+            ) AS words
+        FROM seeded_puzzle_results AS results
+        WHERE results.seed = %s AND results.session_id = %s
+        """
+        async with self._db_conn.cursor(
+            row_factory=class_row(data_models.SeededPuzzleResult)
+        ) as cur:
+            await cur.execute(query, (seed, session_id))
+            return await cur.fetchone()
+
+    @timed_query
+    async def _db_seeded_puzzle_results_top(
+        self, seed: str, finished_after_secs: float, limit: int
+    ) -> list[tuple[UUID, int]]:
+        """List the (session id, points) of the top finished results, best first."""
+        query = """
+        SELECT session_id, points FROM seeded_puzzle_results
+        WHERE seed = %s
+            AND (done OR start <= NOW() - make_interval(secs => %s))
+        ORDER BY points DESC, start ASC
+        LIMIT %s
+        """
+        async with self._db_conn.cursor() as cur:
+            await cur.execute(query, (seed, finished_after_secs, limit))
+            return [(session_id, points) for session_id, points in await cur.fetchall()]
+
+    @timed_query
+    async def _db_seeded_puzzle_results_count_above(
+        self, seed: str, finished_after_secs: float, points: int
+    ) -> int:
+        """Count the finished results on a puzzle with more than the given points."""
+        async with self._db_conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT COUNT(*) FROM seeded_puzzle_results
+                WHERE seed = %s
+                    AND (done OR start <= NOW() - make_interval(secs => %s))
+                    AND points > %s
+                """,
+                (seed, finished_after_secs, points),
+            )
+            result = await cur.fetchone()
+            return 0 if result is None else result[0]
@@ -0,0 +1,56 @@
+from src.solver.trie import Trie
+from src.versus_game.domain import Grid, Point
+
+MIN_WORD_LEN = 3
+"""Shorter words are never worth points, so the solver skips them."""
+
+
+def grid_neighbors(grid: Grid) -> dict[Point, list[Point]]:
+    """Map every present tile to the present tiles adjacent to it (incl diagonals)."""
+    out: dict[Point, list[Point]] = {}
+    for y, row in enumerate(grid):
+        for x, tile in enumerate(row):
+            if tile is None:
+                continue
+            out[Point(x=x, y=y)] = [
+                Point(x=x + dx, y=y + dy)
+                for dy in (-1, 0, 1)
+                for dx in (-1, 0, 1)
+                if (dx, dy) != (0, 0)
+                and 0 <= y + dy < len(grid)
+                and 0 <= x + dx < len(grid[y + dy])
+                and grid[y + dy][x + dx] is not None
+            ]
+    return out
+
+
+def solve_grid(grid: Grid, trie: Trie) -> dict[str, list[Point]]:
+    """Find every dictionary word traceable on the grid, with one path for each."""
+    neighbors = grid_neighbors(grid)
+    found: dict[str, list[Point]] = {}
+
+    def visit(point: Point, node_id: int, word: str, path: list[Point]) -> None:
+        if trie.is_terminus(node_id) and len(word) >= MIN_WORD_LEN:
+            found.setdefault(word, list(path))
+        for neighbor in neighbors[point]:
+            if neighbor in path:
+                continue
+            tile = grid[neighbor.y][neighbor.x]
+            if tile is None:
+                continue
+            child_id = trie.child(node_id, tile)
+            if child_id is None:
+                continue
+            path.append(neighbor)
+            visit(neighbor, child_id, word + tile, path)
+            path.pop()
+
+    for point in neighbors:
+        tile = grid[point.y][point.x]
+        if tile is None:
+            continue
+        node_id = trie.child(0, tile)
+        if node_id is not None:
+            visit(point, node_id, tile, [point])
+
+    return found
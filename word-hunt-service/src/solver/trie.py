@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+
+class Trie:
+    """A trie of valid dictionary words, stored flat.
+
+    Node 0 is the root and holds no letter. Each node's children are kept as a map of
+    letter to node id.
+    """
+
+    _next: list[dict[str, int]]
+    _terminus: list[bool]
+
+    def __init__(self, words: list[str]) -> None:
+        self._next = [{}]
+        self._terminus = [False]
+        for word in words:
+            self.add_word(word)
+
+    @staticmethod
+    def from_file(path: str | Path) -> Trie:
+        """Load a trie from a newline-separated word list.
+
+        Words are upper-cased to match grid tiles, non-alphabetic entries are skipped.
+        """
+        with Path(path).open(encoding="utf-8") as f:
+            words = [line.strip().upper() for line in f]
+        return Trie([word for word in words if word.isalpha()])
+
+    def __len__(self) -> int:
+        return sum(self._terminus)
+
+    def add_word(self, word: str) -> None:
+        """Add a new word to the trie."""
+        if len(word) == 0:
+            return
+        node_id = 0
+        for letter in word:
+            child_id = self._next[node_id].get(letter)
+            if child_id is None:
+                child_id = len(self._next)
+                self._next.append({})
+                self._terminus.append(False)
+                self._next[node_id][letter] = child_id
+            node_id = child_id
+        self._terminus[node_id] = True
+
+    def child(self, node_id: int, letters: str) -> int | None:
+        """Walk from the given node along some letters, return the reached node id."""
+        cur_id: int | None = node_id
+        for letter in letters:
+            if cur_id is None:
+                return None
+            cur_id = self._next[cur_id].get(letter)
+        return cur_id
+
+    def is_terminus(self, node_id: int) -> bool:
+        """Whether the given node ends a valid word."""
+        return self._terminus[node_id]
+
+    def contains_word(self, word: str) -> bool:
+        """Check whether the trie contains the given word."""
+        node_id = self.child(0, word)
+        return node_id is not None and node_id != 0 and self._terminus[node_id]
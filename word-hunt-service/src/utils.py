@@ -1,12 +1,10 @@
-import random
+from collections import OrderedDict
 from datetime import datetime
-from typing import TypeVar
+from typing import Generic, TypeVar
 
 T = TypeVar("T")
-
-
-def random_alpha() -> str:
-    return random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")  # noqa: S311
+K = TypeVar("K")
+V = TypeVar("V")
 
 
 def list_get(ls: list[T] | None, ind: int) -> T | None:
@@ -21,3 +19,29 @@ def list_get(ls: list[T] | None, ind: int) -> T | None:
 def elapsed_secs(dt: datetime) -> float:
     """Get the number of seconds elapsed since the given datetime."""
     return (datetime.now() - dt).total_seconds()
+
+
+class LRUCache(Generic[K, V]):
+    """A mapping that only keeps its `max_size` most recently used entries."""
+
+    max_size: int
+    _items: OrderedDict[K, V]
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
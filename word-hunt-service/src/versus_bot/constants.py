@@ -0,0 +1,8 @@
+BOT_IDLE_POLL_SECS = 1.0
+"""How often a bot that's waiting on its opponent to start checks the game."""
+
+BOT_MAX_CONCURRENT_STEPS = 4
+"""How many bot steps may hold a pool connection at once, the rest are for requests."""
+
+BOT_MAX_STEP_FAILURES = 5
+"""After this many consecutive failed steps, a bot abandons its game."""
@@ -0,0 +1,57 @@
+import random
+from dataclasses import dataclass
+from typing import Literal
+
+from src.versus_game.domain import GameMode, Point
+
+BotSkillName = Literal["easy", "medium", "hard"]
+
+
+@dataclass(frozen=True)
+class BotSkill:
+    find_fraction: float
+    """Fraction of the board's solvable words the bot will find."""
+
+    secs_per_word: float
+    """Mean delay between the bot's found words."""
+
+    start_delay_secs: float
+    """Delay between the bot starting and its first word."""
+
+
+BOT_SKILLS: dict[BotSkillName, BotSkill] = {
+    "easy": BotSkill(find_fraction=0.1, secs_per_word=6.0, start_delay_secs=4.0),
+    "medium": BotSkill(find_fraction=0.25, secs_per_word=3.5, start_delay_secs=3.0),
+    "hard": BotSkill(find_fraction=0.5, secs_per_word=2.0, start_delay_secs=2.0),
+}
+
+
+@dataclass(frozen=True)
+class BotPlannedWord:
+    """A word the bot will submit, and when, relative to its own start."""
+
+    at_secs: float
+    word: str
+    path: list[Point]
+
+
+def plan_bot_words(
+    solutions: dict[str, list[Point]], skill: BotSkill, mode: GameMode
+) -> list[BotPlannedWord]:
+    """Pick which of the board's words a bot finds, and pace them over the game.
+
+    Words are found roughly shortest-first like a human would, and anything that would
+    land after the bot's time is up is dropped.
+    """
+    found_count = round(len(solutions) * skill.find_fraction)
+    words = random.sample(sorted(solutions), found_count)
+    words.sort(key=lambda word: len(word) + random.random() * 2)  # noqa: S311
+
+    out: list[BotPlannedWord] = []
+    at_secs = skill.start_delay_secs
+    for word in words:
+        if at_secs >= mode.duration_secs - 1:
+            break
+        out.append(BotPlannedWord(at_secs=at_secs, word=word, path=solutions[word]))
+        at_secs += random.expovariate(1 / skill.secs_per_word)
+    return out
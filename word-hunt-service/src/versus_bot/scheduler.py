@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from src import utils
+from src.solver.domain import solve_grid
+from src.solver.trie import Trie
+from src.versus_bot.constants import (
+    BOT_IDLE_POLL_SECS,
+    BOT_MAX_CONCURRENT_STEPS,
+    BOT_MAX_STEP_FAILURES,
+)
+from src.versus_bot.domain import BotPlannedWord, BotSkill, plan_bot_words
+from src.versus_game.domain import GameMode, Grid, OrientedPlayers, Point
+from src.versus_game.service import VersusGameService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BotGame:
+    """A bot's in-process state for a single game."""
+
+    game_id: UUID
+    session_id: UUID
+    grid: Grid
+    mode: GameMode
+    skill: BotSkill
+    plan: list[BotPlannedWord] | None = None
+    next_word: int = 0
+    started_at: float | None = None
+    failures: int = 0
+
+
+class VersusBotScheduler:
+    """Drives every bot player in this process from a single asyncio task.
+
+    Bots wait in a heap keyed by when they next need to act, so idle bots cost nothing
+    but memory. Bots play through the same service as request handlers. Their steps
+    are bounded by a semaphore, so that bots can never starve request handling of
+    connections.
+
+    Bot state is not persisted. If the process restarts, its bots stop playing and their
+    games end at the usual auto-end time.
+    """
+
+    _versus_games: VersusGameService
+    _trie: Trie
+    _heap: list[tuple[float, int, _BotGame]]
+    _seq: int
+    _wakeup: asyncio.Event
+    _step_sem: asyncio.Semaphore
+    _step_tasks: set[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        versus_games: VersusGameService,
+        trie: Trie,
+        max_concurrent_steps: int = BOT_MAX_CONCURRENT_STEPS,
+    ) -> None:
+        self._versus_games = versus_games
+        self._trie = trie
+        self._heap = []
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._step_sem = asyncio.Semaphore(max_concurrent_steps)
+        self._step_tasks = set()
+
+    def __len__(self) -> int:
+        """How many bots are currently playing."""
+        return len(self._heap) + len(self._step_tasks)
+
+    def add(
+        self,
+        game_id: UUID,
+        session_id: UUID,
+        grid: Grid,
+        mode: GameMode,
+        skill: BotSkill,
+    ) -> None:
+        """Have a bot play the given game as the given session."""
+        bot = _BotGame(
+            game_id=game_id, session_id=session_id, grid=grid, mode=mode, skill=skill
+        )
+        self._schedule(bot, time.monotonic())
+
+    async def run(self) -> None:
+        """Step bots as they come due, until cancelled."""
+        try:
+            while True:
+                self._wakeup.clear()
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, bot = heapq.heappop(self._heap)
+                    task = asyncio.create_task(self._step(bot))
+                    self._step_tasks.add(task)
+                    task.add_done_callback(self._step_tasks.discard)
+                timeout = self._heap[0][0] - now if self._heap else None
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+        finally:
+            for task in self._step_tasks:
+                task.cancel()
+
+    def _schedule(self, bot: _BotGame, at: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (at, self._seq, bot))
+        self._wakeup.set()
+
+    async def _step(self, bot: _BotGame) -> None:
+        """Run a single step for a bot, and reschedule it if it's still playing."""
+        try:
+            # Solving is CPU-bound, keep it off the event loop and outside a connection
+            if bot.plan is None:
+                solutions = await asyncio.to_thread(solve_grid, bot.grid, self._trie)
+                bot.plan = plan_bot_words(solutions, bot.skill, bot.mode)
+            async with self._step_sem:
+                next_at = await self._step_in_game(bot, bot.plan)
+            bot.failures = 0
+        except Exception:
+            bot.failures += 1
+            logger.exception("Bot step failed for game %s", bot.game_id)
+            if bot.failures >= BOT_MAX_STEP_FAILURES:
+                return
+            next_at = time.monotonic() + BOT_IDLE_POLL_SECS
+        if next_at is not None:
+            self._schedule(bot, next_at)
+
+    async def _step_in_game(
+        self, bot: _BotGame, plan: list[BotPlannedWord]
+    ) -> float | None:
+        """Act on the game as the bot player. Returns when to step next, if ever."""
+        versus_games = self._versus_games
+        game = await versus_games.load(bot.game_id)
+        if game is None:
+            return None
+
+        # Stop once the game no longer accepts our words
+        players = game.get_oriented_players(bot.session_id)
+        if players is None or not game.player_may_submit(bot.session_id):
+            return None
+
+        # The bot's clock starts once its opponent's does
+        now = time.monotonic()
+        if bot.started_at is None:
+            return await self._start_with_opponent(bot, plan, players, now)
+
+        # Submit every word that's come due, through the same checks as a client
+        elapsed = now - bot.started_at
+        paths: list[list[Point]] = []
+        while bot.next_word < len(plan) and plan[bot.next_word].at_secs <= elapsed:
+            paths.append(plan[bot.next_word].path)
+            bot.next_word += 1
+        if paths:
+            await versus_games.submit_words(game, bot.session_id, paths)
+
+        # Declare done once out of time, otherwise wait for the next word
+        secs_remaining = players.this_player.play_secs_remaining() or 0
+        if secs_remaining <= 0:
+            await versus_games.set_done(bot.game_id, bot.session_id)
+            return None
+        if bot.next_word < len(plan):
+            return min(
+                bot.started_at + plan[bot.next_word].at_secs, now + secs_remaining
+            )
+        return now + secs_remaining
+
+    async def _start_with_opponent(
+        self,
+        bot: _BotGame,
+        plan: list[BotPlannedWord],
+        players: OrientedPlayers,
+        now: float,
+    ) -> float:
+        """Start the bot if its opponent has started. Returns when to step next."""
+        other_start = players.other_player.start
+        if other_start is None:
+            return now + BOT_IDLE_POLL_SECS
+        await self._versus_games.start(bot.game_id, bot.session_id)
+        # Time words from the opponent's recorded start, not from when we noticed it
+        bot.started_at = now - max(utils.elapsed_secs(other_start), 0)
+        return bot.started_at + (plan[0].at_secs if plan else bot.mode.duration_secs)
@@ -1,10 +1,8 @@
-GAME_DURATION_SECS = 80
-"""How long a game is."""
+GAME_AUTO_END_GRACE_SECS = 30
+"""After a game's duration plus this many seconds, the game will force end even if both
+clients aren't done."""
 
-GAME_AUTO_END_SECS = GAME_DURATION_SECS + 30
-"""After this many seconds, the game will force end even if both clients aren't done."""
-
-POINTS_BY_LEN = {
+CLASSIC_POINTS_BY_LEN = {
     3: 100,
     4: 400,
     5: 800,
@@ -12,4 +10,26 @@ POINTS_BY_LEN = {
     7: 1800,
     8: 2200,
 }
-"""How many points are awarded for words of the given length."""
+"""How many points are awarded for words of the given length, in the classic scoring."""
+
+CLASSIC_POINTS_PER_EXTRA_LETTER = 400
+"""How many more points each letter past 8 is worth, in the classic scoring."""
+
+FINALIZED_GAME_CACHE_SIZE = 10_000
+"""How many pre-serialized finalized game views to keep in memory."""
+
+IN_MEMORY_GAME_RETENTION_SECS = 24 * 60 * 60
+"""How long the in-memory backend keeps games, since nothing else ever removes them."""
+
+WORD_WRITE_MAX_DELAY_SECS = 0.02
+"""How long the write-behind holds an accepted word, to batch it with others."""
+
+WORD_WRITE_MAX_BATCH = 5000
+"""Flush the write-behind early once this many words are waiting."""
+
+WORD_WRITE_MAX_ATTEMPTS = 3
+"""How many times the write-behind tries a batch before writing its games one by one."""
+
+WORD_WRITE_SETTLE_SECS = 5
+"""How long after a game auto-ends to assume every replica's write-behind has written
+the game's words."""
@@ -21,6 +21,8 @@ class VersusGame(BaseModel):
     player_b_start: datetime | None
     player_b_done: bool
     grid: Grid
+    mode: str
+    version: int
 
 
 class VersusGameSubmittedWord(BaseModel):
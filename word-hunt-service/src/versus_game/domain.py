@@ -8,10 +8,11 @@ from uuid import UUID
 
 from src import utils
 from src.versus_game.constants import (
-    GAME_AUTO_END_SECS,
-    GAME_DURATION_SECS,
-    POINTS_BY_LEN,
+    CLASSIC_POINTS_BY_LEN,
+    CLASSIC_POINTS_PER_EXTRA_LETTER,
+    GAME_AUTO_END_GRACE_SECS,
 )
+from src.versus_game.letters import LetterSampler
 
 Grid = list[list[str | None]]
 GridTemplate = list[list[bool]]
@@ -48,6 +49,90 @@ GRID_TEMPLATES: dict[GridTemplateName, GridTemplate] = {
     ],
 }
 
+MAX_WORD_LEN = max(
+    sum(cell for row in template for cell in row)
+    for template in GRID_TEMPLATES.values()
+)
+"""The longest word any template can fit, using every tile once."""
+
+GameModeName = Literal["classic", "blitz", "marathon"]
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    """How many points words are worth, as configured."""
+
+    points_by_len: dict[int, int]
+    """Points for words of the given length, unlisted lengths are worth nothing."""
+
+    points_per_extra_letter: int
+    """Points added per letter beyond the longest length in `points_by_len`."""
+
+    def compile(self) -> tuple[int, ...]:
+        """Compile into the points for each word length, up to `MAX_WORD_LEN`."""
+        longest = max(self.points_by_len)
+        return tuple(
+            self.points_by_len.get(word_len, 0)
+            if word_len <= longest
+            else self.points_by_len[longest]
+            + (word_len - longest) * self.points_per_extra_letter
+            for word_len in range(MAX_WORD_LEN + 1)
+        )
+
+
+CLASSIC_SCORING = ScoringRule(
+    points_by_len=CLASSIC_POINTS_BY_LEN,
+    points_per_extra_letter=CLASSIC_POINTS_PER_EXTRA_LETTER,
+)
+
+
+@dataclass(frozen=True)
+class GameMode:
+    """The rules a game is played by, fixed when the game is created."""
+
+    name: GameModeName
+    duration_secs: float
+    """How long each player gets to play."""
+
+    template_names: tuple[GridTemplateName, ...]
+    """Templates a game's grid is picked from."""
+
+    points_by_len: tuple[int, ...]
+    """Points indexed by word length, see `ScoringRule.compile()`."""
+
+    def auto_end_secs(self) -> float:
+        """After this many seconds, the game will force end even if both clients
+        aren't done.
+        """
+        return self.duration_secs + GAME_AUTO_END_GRACE_SECS
+
+    def word_points(self, word: str) -> int:
+        return self.points_by_len[min(len(word), len(self.points_by_len) - 1)]
+
+
+GAME_MODES: dict[GameModeName, GameMode] = {
+    "classic": GameMode(
+        name="classic",
+        duration_secs=80,
+        template_names=("standard", "o", "x", "big"),
+        points_by_len=CLASSIC_SCORING.compile(),
+    ),
+    "blitz": GameMode(
+        name="blitz",
+        duration_secs=30,
+        template_names=("standard",),
+        points_by_len=CLASSIC_SCORING.compile(),
+    ),
+    "marathon": GameMode(
+        name="marathon",
+        duration_secs=180,
+        template_names=("big",),
+        points_by_len=CLASSIC_SCORING.compile(),
+    ),
+}
+"""Every game mode, by name. Modes are stored per game by name, so a mode's rules
+mustn't change while games played by them may still be running."""
+
 
 @dataclass(frozen=True)
 class Point:
@@ -68,13 +153,14 @@ class VersusGameSubmittedWord:
         deduped = {word.word: word for word in words}
         return list(deduped.values())
 
-    def points(self) -> int:
-        return POINTS_BY_LEN.get(len(self.word), 0)
+    def points(self, mode: GameMode) -> int:
+        return mode.word_points(self.word)
 
 
 @dataclass(frozen=True)
 class VersusGamePlayer:
     session_id: UUID
+    mode: GameMode
     start: datetime | None
     done: bool
     submitted_words: list[VersusGameSubmittedWord]
@@ -85,10 +171,10 @@ class VersusGamePlayer:
             return None
         if self.done:
             return 0
-        return max(GAME_DURATION_SECS - utils.elapsed_secs(self.start), 0)
+        return max(self.mode.duration_secs - utils.elapsed_secs(self.start), 0)
 
     def points(self) -> int:
-        return sum(word.points() for word in self.submitted_words)
+        return sum(word.points(self.mode) for word in self.submitted_words)
 
 
 @dataclass(frozen=True)
@@ -106,6 +192,9 @@ class VersusGame:
     player_a: VersusGamePlayer
     player_b: VersusGamePlayer
     grid: Grid
+    mode: GameMode
+    version: int
+    """Bumped on every write to the game, including submitted words."""
 
     def get_oriented_players(self, session_id: UUID) -> OrientedPlayers | None:
         """Get a the players oriented by context."""
@@ -121,7 +210,7 @@ class VersusGame:
 
     def secs_to_auto_end(self) -> float:
         """How many seconds remain until the game auto-ends. 0 if over."""
-        return max(GAME_AUTO_END_SECS - utils.elapsed_secs(self.created_at), 0)
+        return max(self.mode.auto_end_secs() - utils.elapsed_secs(self.created_at), 0)
 
     def player_may_submit(self, session_id: UUID) -> bool:
         """Whether the player identified by the given sid is permitted to submit again.
@@ -154,21 +243,45 @@ class VersusGame:
             == 0
         )
 
+    def finalized(self) -> bool:
+        """Whether nothing about the game can change anymore, including over time.
+
+        Stricter than `ended()`: the game has ended, no player may submit, and every
+        player's clock has either run out or never started.
+        """
+        players = (self.player_a, self.player_b)
+        return (
+            self.ended()
+            and not any(self.player_may_submit(player.session_id) for player in players)
+            and all(player.play_secs_remaining() in (None, 0) for player in players)
+        )
+
     def extract_word(self, path: list[Point]) -> str | None:
-        out = ""
-        for point in path:
-            item = utils.list_get(utils.list_get(self.grid, point.y), point.x)
-            if item is None:
-                return None
-            out += item
-        return out or None
+        return extract_word(self.grid, path)
+
+
+def extract_word(grid: Grid, path: list[Point]) -> str | None:
+    """Read the word a path of tiles spells on the grid, if every tile is present."""
+    out = ""
+    for point in path:
+        item = utils.list_get(utils.list_get(grid, point.y), point.x)
+        if item is None:
+            return None
+        out += item
+    return out or None
 
 
-def random_grid(template: GridTemplate) -> Grid:
-    return [
-        [utils.random_alpha() if cell else None for cell in row] for row in template
-    ]
+def random_grid(
+    template: GridTemplate, letters: LetterSampler, rng: random.Random | None = None
+) -> Grid:
+    return [[letters.sample(rng) if cell else None for cell in row] for row in template]
 
 
-def random_template_and_grid() -> Grid:
-    return random_grid(random.choice(list(GRID_TEMPLATES.values())))  # noqa: S311
+def random_template_and_grid(
+    mode: GameMode, letters: LetterSampler, rng: random.Random | None = None
+) -> Grid:
+    """Draw a grid for the mode, from the given random generator if any. A seeded
+    generator always draws the same grid, so long as the mode and letters don't change.
+    """
+    template_name = (rng or random).choice(mode.template_names)
+    return random_grid(GRID_TEMPLATES[template_name], letters, rng)
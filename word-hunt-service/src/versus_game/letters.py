@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import random
+from pathlib import Path
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class LetterSampler:
+    """Draws grid letters at random, in proportion to each letter's weight.
+
+    Weights are stored as a JSON object of letter to weight, as exported by
+    `bench/boards.py`.
+    """
+
+    weights: dict[str, float]
+    _letters: list[str]
+    _cum_weights: list[float]
+
+    def __init__(self, weights: dict[str, float]) -> None:
+        unknown = set(weights) - set(ALPHABET)
+        if unknown:
+            raise ValueError(f"Cannot sample non-letters {sorted(unknown)}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Letter weights must not be negative")
+        if sum(weights.values()) <= 0:
+            raise ValueError("Some letter must have a positive weight")
+        self.weights = dict(weights)
+        self._letters = list(weights)
+        self._cum_weights = list(itertools.accumulate(weights.values()))
+
+    @staticmethod
+    def uniform() -> LetterSampler:
+        """A sampler drawing every letter equally often."""
+        return LetterSampler(dict.fromkeys(ALPHABET, 1.0))
+
+    @staticmethod
+    def from_file(path: str | Path) -> LetterSampler:
+        """Load a sampler from a JSON object of letter to weight."""
+        with Path(path).open(encoding="utf-8") as f:
+            return LetterSampler(json.load(f))
+
+    def save(self, path: str | Path) -> None:
+        """Save the sampler's weights, for `from_file()`."""
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(self.weights, f, indent=2)
+            f.write("\n")
+
+    def sample(self, rng: random.Random | None = None) -> str:
+        """Draw a single letter, from the given random generator if any."""
+        at = (rng or random).random() * self._cum_weights[-1]
+        return self._letters[bisect.bisect(self._cum_weights, at)]
+
+
+UNIFORM_LETTERS = LetterSampler.uniform()
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from src.versus_game import data_models, domain
+from src.versus_game.constants import IN_MEMORY_GAME_RETENTION_SECS
+from src.versus_game.repository import VersusGameRepository
+
+
+class InMemoryVersusGameStore:
+    """Versus games held in process memory, shared by every repository over it.
+
+    Games are kept in creation order, so expired ones are pruned from the front.
+    """
+
+    games: dict[UUID, data_models.VersusGame]
+    submitted_words: dict[UUID, list[data_models.VersusGameSubmittedWord]]
+
+    def __init__(self) -> None:
+        self.games = {}
+        self.submitted_words = {}
+
+    def prune(self) -> None:
+        """Forget games older than `IN_MEMORY_GAME_RETENTION_SECS`."""
+        cutoff = datetime.now() - timedelta(seconds=IN_MEMORY_GAME_RETENTION_SECS)
+        for game_id, game in list(self.games.items()):
+            if game.created_at > cutoff:
+                break
+            del self.games[game_id]
+            self.submitted_words.pop(game_id, None)
+
+
+class InMemoryVersusGameRepository(VersusGameRepository):
+    """A versus game repository over an in-memory store, see
+    `InMemoryRepositoryBackend`.
+    """
+
+    _store: InMemoryVersusGameStore
+
+    def __init__(self, store: InMemoryVersusGameStore) -> None:
+        self._store = store
+
+    async def update_versus_game_player_start(
+        self, game_id: UUID, session_id: UUID
+    ) -> None:
+        """Set the given player to be started."""
+        game = self._get_player_game(game_id, session_id)
+        if game is None:
+            return
+        now = datetime.now()
+        self._store.games[game_id] = game.model_copy(
+            update={
+                "player_a_start": now
+                if game.player_a_session_id == session_id
+                and game.player_a_start is None
+                else game.player_a_start,
+                "player_b_start": now
+                if game.player_b_session_id == session_id
+                and game.player_b_start is None
+                else game.player_b_start,
+                "version": game.version + 1,
+            }
+        )
+
+    async def update_versus_game_player_done(
+        self, game_id: UUID, session_id: UUID
+    ) -> None:
+        """Set the given player to be done submitting words."""
+        game = self._get_player_game(game_id, session_id)
+        if game is None:
+            return
+        self._store.games[game_id] = game.model_copy(
+            update={
+                "player_a_done": game.player_a_done
+                or game.player_a_session_id == session_id,
+                "player_b_done": game.player_b_done
+                or game.player_b_session_id == session_id,
+                "version": game.version + 1,
+            }
+        )
+
+    def _get_player_game(
+        self, game_id: UUID, session_id: UUID
+    ) -> data_models.VersusGame | None:
+        """Get a game, only if the given session plays in it."""
+        game = self._store.games.get(game_id)
+        if game is None or session_id not in (
+            game.player_a_session_id,
+            game.player_b_session_id,
+        ):
+            return None
+        return game
+
+    async def _db_versus_game_construct(
+        self,
+        game_id: UUID,
+        player_a_session_id: UUID,
+        player_b_session_id: UUID,
+        grid: domain.Grid,
+        mode_name: domain.GameModeName,
+    ) -> data_models.VersusGame:
+        """Construct a new versus game."""
+        if game_id in self._store.games:
+            raise ValueError(f"Game {game_id} already exists")
+        self._store.prune()
+        game = data_models.VersusGame(
+            id=game_id,
+            created_at=datetime.now(),
+            player_a_session_id=player_a_session_id,
+            player_a_start=None,
+            player_a_done=False,
+            player_b_session_id=player_b_session_id,
+            player_b_start=None,
+            player_b_done=False,
+            grid=grid,
+            mode=mode_name,
+            version=0,
+        )
+        self._store.games[game_id] = game
+        return game
+
+    async def _db_versus_game_get(self, game_id: UUID) -> data_models.VersusGame | None:
+        """Get a versus game data model."""
+        return self._store.games.get(game_id)
+
+    async def _db_versus_games_bump_version(self, game_ids: list[UUID]) -> None:
+        for game_id in game_ids:
+            game = self._store.games.get(game_id)
+            if game is not None:
+                self._store.games[game_id] = game.model_copy(
+                    update={"version": game.version + 1}
+                )
+
+    async def _db_versus_game_submitted_words_list(
+        self, game_id: UUID
+    ) -> list[data_models.VersusGameSubmittedWord]:
+        return list(self._store.submitted_words.get(game_id, []))
+
+    async def _db_versus_game_submitted_words_insert(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        # Validate everything up front, so a bad word inserts nothing, like a failed
+        # statement would
+        for submitted_word in submitted_words:
+            if submitted_word.game_id not in self._store.games:
+                raise ValueError(f"Game {submitted_word.game_id} does not exist")
+        for submitted_word in submitted_words:
+            self._store.submitted_words.setdefault(submitted_word.game_id, []).append(
+                submitted_word
+            )
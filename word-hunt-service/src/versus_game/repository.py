@@ -1,18 +1,20 @@
-import asyncio
+from abc import ABC, abstractmethod
+from typing import cast
 from uuid import UUID, uuid4
 
 from psycopg import AsyncConnection
 from psycopg.rows import class_row
 from psycopg.types.json import Jsonb
 
+from src.instrumentation.metrics import timed_query
 from src.versus_game import data_models, domain
 
 
-class VersusGameRepository:
-    _db_conn: AsyncConnection
+class VersusGameRepository(ABC):
+    """Versus game storage, building domain models from the storage's data models.
 
-    def __init__(self, db_conn: AsyncConnection) -> None:
-        self._db_conn = db_conn
+    Backends implement the `_db_*` primitives and the player updates.
+    """
 
     async def create_versus_game(
         self,
@@ -20,67 +22,36 @@ class VersusGameRepository:
         player_a_session_id: UUID,
         player_b_session_id: UUID,
         grid: domain.Grid,
+        mode: domain.GameMode,
     ) -> domain.VersusGame:
         db_game = await self._db_versus_game_construct(
-            game_id, player_a_session_id, player_b_session_id, grid
+            game_id, player_a_session_id, player_b_session_id, grid, mode.name
         )
         return self._build_versus_game(db_game, [])
 
     async def get_versus_game(self, game_id: UUID) -> domain.VersusGame | None:
         """Get a versus game from the DB."""
 
-        db_game, db_submitted_words = await asyncio.gather(
-            self._db_versus_game_get(game_id),
-            self._db_versus_game_submitted_words_list(game_id),
-        )
+        # One after the other: a connection runs one query at a time anyway, and
+        # gathering would time the second query's wait on the first as its own
+        db_game = await self._db_versus_game_get(game_id)
         if db_game is None:
             return None
+        db_submitted_words = await self._db_versus_game_submitted_words_list(game_id)
 
         return self._build_versus_game(db_game, db_submitted_words)
 
+    @abstractmethod
     async def update_versus_game_player_start(
         self, game_id: UUID, session_id: UUID
     ) -> None:
         """Set the given player to be started."""
-        query = """
-        UPDATE versus_games
-        SET
-            player_a_start = (CASE
-                WHEN player_a_session_id = %s AND player_a_start IS NULL THEN NOW()
-                ELSE player_a_start
-            END),
-            player_b_start = (CASE
-                WHEN player_b_session_id = %s AND player_b_start IS NULL THEN NOW()
-                ELSE player_b_start
-            END)
-        WHERE id = %s AND (player_a_session_id = %s OR player_b_session_id = %s)
-        """
-        await self._db_conn.execute(
-            query,
-            (session_id, session_id, game_id, session_id, session_id),
-        )
 
+    @abstractmethod
     async def update_versus_game_player_done(
         self, game_id: UUID, session_id: UUID
     ) -> None:
         """Set the given player to be done submitting words."""
-        query = """
-        UPDATE versus_games
-        SET
-            player_a_done = (CASE
-                WHEN player_a_session_id = %s THEN TRUE
-                ELSE player_a_done
-            END),
-            player_b_done = (CASE
-                WHEN player_b_session_id = %s THEN TRUE
-                ELSE player_b_done
-            END)
-        WHERE id = %s AND (player_a_session_id = %s OR player_b_session_id = %s)
-        """
-        await self._db_conn.execute(
-            query,
-            (session_id, session_id, game_id, session_id, session_id),
-        )
 
     async def update_versus_game_submit_words(
         self,
@@ -102,7 +73,21 @@ class VersusGameRepository:
             )
             for (word, path) in validated_words
         ]
+        # Bump only after inserting, so a reader can't see the new version without
+        # the new words
         await self._db_versus_game_submitted_words_insert(submitted_words)
+        await self._db_versus_games_bump_version([game_id])
+
+    async def insert_versus_game_submitted_words_batch(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        """Insert _validated_ words submitted to any number of games at once, e.g. as
+        batched by a `SubmittedWordWriter`.
+        """
+        await self._db_versus_game_submitted_words_bulk_insert(submitted_words)
+        await self._db_versus_games_bump_version(
+            list({submitted_word.game_id for submitted_word in submitted_words})
+        )
 
     def _build_versus_game(
         self,
@@ -112,11 +97,14 @@ class VersusGameRepository:
         """Given the data models for a versus game and a set of submitted words, build
         the domain model.
         """
+        # Resolve the mode once, every player and word scores off this same one
+        mode = domain.GAME_MODES[cast(domain.GameModeName, db_game.mode)]
         return domain.VersusGame(
             game_id=db_game.id,
             created_at=db_game.created_at,
             player_a=domain.VersusGamePlayer(
                 session_id=db_game.player_a_session_id,
+                mode=mode,
                 start=db_game.player_a_start,
                 done=db_game.player_a_done,
                 submitted_words=domain.VersusGameSubmittedWord.dedup(
@@ -135,6 +123,7 @@ class VersusGameRepository:
             ),
             player_b=domain.VersusGamePlayer(
                 session_id=db_game.player_b_session_id,
+                mode=mode,
                 start=db_game.player_b_start,
                 done=db_game.player_b_done,
                 submitted_words=domain.VersusGameSubmittedWord.dedup(
@@ -152,20 +141,117 @@ class VersusGameRepository:
                 ),
             ),
             grid=db_game.grid,
+            mode=mode,
+            version=db_game.version,
         )
 
+    @abstractmethod
     async def _db_versus_game_construct(
         self,
         game_id: UUID,
         player_a_session_id: UUID,
         player_b_session_id: UUID,
         grid: domain.Grid,
+        mode_name: domain.GameModeName,
     ) -> data_models.VersusGame:
         """Construct a new versus game."""
 
+    @abstractmethod
+    async def _db_versus_game_get(self, game_id: UUID) -> data_models.VersusGame | None:
+        """Get a versus game data model."""
+
+    @abstractmethod
+    async def _db_versus_games_bump_version(self, game_ids: list[UUID]) -> None:
+        """Increment each of the given versus games' versions."""
+
+    @abstractmethod
+    async def _db_versus_game_submitted_words_list(
+        self, game_id: UUID
+    ) -> list[data_models.VersusGameSubmittedWord]:
+        """List every word submitted to a versus game."""
+
+    @abstractmethod
+    async def _db_versus_game_submitted_words_insert(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        """Insert submitted words."""
+
+    async def _db_versus_game_submitted_words_bulk_insert(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        """Insert many submitted words. Backends may override with a faster path."""
+        await self._db_versus_game_submitted_words_insert(submitted_words)
+
+
+class PostgresVersusGameRepository(VersusGameRepository):
+    _db_conn: AsyncConnection
+
+    def __init__(self, db_conn: AsyncConnection) -> None:
+        self._db_conn = db_conn
+
+    @timed_query
+    async def update_versus_game_player_start(
+        self, game_id: UUID, session_id: UUID
+    ) -> None:
+        """Set the given player to be started."""
         query = """
-        INSERT INTO versus_games (id, player_a_session_id, player_b_session_id, grid)
-        VALUES (%s, %s, %s, %s)
+        UPDATE versus_games
+        SET
+            player_a_start = (CASE
+                WHEN player_a_session_id = %s AND player_a_start IS NULL THEN NOW()
+                ELSE player_a_start
+            END),
+            player_b_start = (CASE
+                WHEN player_b_session_id = %s AND player_b_start IS NULL THEN NOW()
+                ELSE player_b_start
+            END),
+            version = version + 1
+        WHERE id = %s AND (player_a_session_id = %s OR player_b_session_id = %s)
+        """
+        await self._db_conn.execute(
+            query,
+            (session_id, session_id, game_id, session_id, session_id),
+        )
+
+    @timed_query
+    async def update_versus_game_player_done(
+        self, game_id: UUID, session_id: UUID
+    ) -> None:
+        """Set the given player to be done submitting words."""
+        query = """
+        UPDATE versus_games
+        SET
+            player_a_done = (CASE
+                WHEN player_a_session_id = %s THEN TRUE
+                ELSE player_a_done
+            END),
+            player_b_done = (CASE
+                WHEN player_b_session_id = %s THEN TRUE
+                ELSE player_b_done
+            END),
+            version = version + 1
+        WHERE id = %s AND (player_a_session_id = %s OR player_b_session_id = %s)
+        """
+        await self._db_conn.execute(
+            query,
+            (session_id, session_id, game_id, session_id, session_id),
+        )
+
+    @timed_query
+    async def _db_versus_game_construct(
+        self,
+        game_id: UUID,
+        player_a_session_id: UUID,
+        player_b_session_id: UUID,
+        grid: domain.Grid,
+        mode_name: domain.GameModeName,
+    ) -> data_models.VersusGame:
+        """Construct a new versus game."""
+
+        query = """
+        INSERT INTO versus_games
+            (id, player_a_session_id, player_b_session_id, grid, mode)
+        VALUES (%s, %s, %s, %s, %s)
         RETURNING *
         """
         async with self._db_conn.cursor(
@@ -178,6 +264,7 @@ class VersusGameRepository:
                     player_a_session_id,
                     player_b_session_id,
                     Jsonb(grid),
+                    mode_name,
                 ),
             )
             result = await cur.fetchone()
@@ -185,6 +272,7 @@ class VersusGameRepository:
                 raise ValueError("Expected game to exist after insert")
             return result
 
+    @timed_query
     async def _db_versus_game_get(self, game_id: UUID) -> data_models.VersusGame | None:
         """Get a versus game data model."""
 
@@ -194,6 +282,21 @@ class VersusGameRepository:
             await cur.execute("SELECT * FROM versus_games WHERE id = %s", (game_id,))
             return await cur.fetchone()
 
+    async def insert_versus_game_submitted_words_batch(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        # One transaction, so the whole batch costs a single commit
+        async with self._db_conn.transaction():
+            await super().insert_versus_game_submitted_words_batch(submitted_words)
+
+    @timed_query
+    async def _db_versus_games_bump_version(self, game_ids: list[UUID]) -> None:
+        await self._db_conn.execute(
+            "UPDATE versus_games SET version = version + 1 WHERE id = ANY(%s)",
+            (game_ids,),
+        )
+
+    @timed_query
     async def _db_versus_game_submitted_words_list(
         self, game_id: UUID
     ) -> list[data_models.VersusGameSubmittedWord]:
@@ -206,6 +309,7 @@ class VersusGameRepository:
             )
             return await cur.fetchall()
 
+    @timed_query
     async def _db_versus_game_submitted_words_insert(
         self, submitted_words: list[data_models.VersusGameSubmittedWord]
     ) -> None:
@@ -230,3 +334,25 @@ class VersusGameRepository:
                     for submitted_word in submitted_words
                 ],
             )
+
+    @timed_query
+    async def _db_versus_game_submitted_words_bulk_insert(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> None:
+        query = """
+        COPY versus_game_submitted_words (id, game_id, by_session_id, tile_path, word)
+        FROM STDIN
+        """
+        async with self._db_conn.cursor() as cur, cur.copy(query) as copy:
+            for submitted_word in submitted_words:
+                await copy.write_row(
+                    (
+                        submitted_word.id,
+                        submitted_word.game_id,
+                        submitted_word.by_session_id,
+                        Jsonb(
+                            [point.model_dump() for point in submitted_word.tile_path]
+                        ),
+                        submitted_word.word,
+                    )
+                )
@@ -0,0 +1,117 @@
+from uuid import UUID
+
+from src.concurrency import SingleFlight
+from src.repositories import RepositoryBackend
+from src.versus_game.domain import Point, VersusGame
+from src.versus_game.word_writer import SubmittedWordWriter
+
+
+class InvalidPathError(ValueError):
+    """A submitted path doesn't spell a word on the game's grid."""
+
+    index: int
+
+    def __init__(self, index: int) -> None:
+        super().__init__(f"Path {index} invalid")
+        self.index = index
+
+
+class VersusGameService:
+    """Loads versus games and acts on them as their players, the same way for request
+    handlers and bots.
+
+    Concurrent loads of a game share one query. Every write here forgets the load in
+    flight once it returns, so later loads always see the write.
+    """
+
+    word_writer: SubmittedWordWriter | None
+    """Writes submitted words behind, if enabled. The owner must run and close it."""
+
+    _backend: RepositoryBackend
+    _load_flights: SingleFlight[UUID, VersusGame | None]
+
+    def __init__(self, backend: RepositoryBackend, write_behind: bool = False) -> None:
+        self._backend = backend
+        self._load_flights = SingleFlight()
+        self.word_writer = (
+            SubmittedWordWriter(backend, on_written=self.wrote)
+            if write_behind
+            else None
+        )
+
+    async def load(self, game_id: UUID) -> VersusGame | None:
+        """Load a game, sharing the load with any concurrent ones for the same game."""
+
+        async def load() -> VersusGame | None:
+            async with self._backend.repositories() as repositories:
+                return await repositories.versus_game.get_versus_game(game_id)
+
+        return await self._load_flights.do(game_id, load)
+
+    def wrote(self, game_id: UUID) -> None:
+        """Note a write to the game has returned, so later loads don't join one that
+        began before it and miss the write.
+        """
+        self._load_flights.forget(game_id)
+
+    async def start(self, game_id: UUID, session_id: UUID) -> None:
+        """Start the given player's clock, unless it's already running."""
+        async with self._backend.repositories() as repositories:
+            await repositories.versus_game.update_versus_game_player_start(
+                game_id, session_id
+            )
+        self.wrote(game_id)
+
+    async def submit_words(
+        self, game: VersusGame, session_id: UUID, paths: list[list[Point]]
+    ) -> None:
+        """Submit the words the paths spell, as a player of the game who may submit.
+
+        Raises `InvalidPathError` if any path doesn't spell a word, submitting none.
+        """
+        players = game.get_oriented_players(session_id)
+        if players is None:
+            raise ValueError(f"Session {session_id} isn't playing game {game.game_id}")
+
+        try:
+            async with self._backend.repositories() as repositories:
+                versus_game_repository = repositories.versus_game
+
+                # An attempt to submit words qualifies as starting the game, even if
+                # invalid
+                if players.this_player.start is None:
+                    await versus_game_repository.update_versus_game_player_start(
+                        game.game_id, session_id
+                    )
+
+                # Extract words and validate
+                validated_words: list[tuple[str, list[Point]]] = []
+                for i, path in enumerate(paths):
+                    word = game.extract_word(path)
+                    if word is None:
+                        raise InvalidPathError(i)
+                    # TODO: Validate word in dictionary
+                    validated_words.append((word, path))
+
+                # Insert the words into the db, or accept them to be written shortly
+                if self.word_writer is not None:
+                    self.word_writer.submit(game.game_id, session_id, validated_words)
+                else:
+                    await versus_game_repository.update_versus_game_submit_words(
+                        game.game_id, session_id, validated_words
+                    )
+        finally:
+            self.wrote(game.game_id)
+
+    async def set_done(self, game_id: UUID, session_id: UUID) -> None:
+        """Set the given player to be done submitting words."""
+
+        # Write this player's words before they show as done. The writer needs a
+        # pooled connection of its own, so don't hold one while waiting on it
+        if self.word_writer is not None:
+            await self.word_writer.flush_game(game_id)
+        async with self._backend.repositories() as repositories:
+            await repositories.versus_game.update_versus_game_player_done(
+                game_id, session_id
+            )
+        self.wrote(game_id)
@@ -0,0 +1,167 @@
+import asyncio
+import contextlib
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from uuid import UUID, uuid4
+
+from src.instrumentation.metrics import (
+    SUBMITTED_WORDS_BATCH_SIZE,
+    SUBMITTED_WORDS_DROPPED,
+)
+from src.repositories import RepositoryBackend
+from src.versus_game import data_models, domain
+from src.versus_game.constants import (
+    WORD_WRITE_MAX_ATTEMPTS,
+    WORD_WRITE_MAX_BATCH,
+    WORD_WRITE_MAX_DELAY_SECS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SubmittedWordWriter:
+    """Writes submitted words behind the requests that accepted them, in batches.
+
+    Words wait at most `max_delay_secs` to be grouped with words from other requests,
+    then a single task writes them in one transaction. Words arriving while a batch is
+    being written wait for the next one, so batches grow with load.
+
+    Accepted words are only held in memory until written. `close()` writes everything
+    still waiting, but words are lost if the process dies first.
+    """
+
+    _backend: RepositoryBackend
+    _on_written: Callable[[UUID], None] | None
+    _max_delay_secs: float
+    _max_batch: int
+    _pending: list[data_models.VersusGameSubmittedWord]
+    _unwritten_by_game: Counter[UUID]
+    _has_pending: asyncio.Event
+    _batch_full: asyncio.Event
+    _batch_written: asyncio.Event
+    _closed: bool
+
+    def __init__(
+        self,
+        backend: RepositoryBackend,
+        on_written: Callable[[UUID], None] | None = None,
+        max_delay_secs: float = WORD_WRITE_MAX_DELAY_SECS,
+        max_batch: int = WORD_WRITE_MAX_BATCH,
+    ) -> None:
+        """`on_written` is called with each game id whose words a batch wrote."""
+        self._backend = backend
+        self._on_written = on_written
+        self._max_delay_secs = max_delay_secs
+        self._max_batch = max_batch
+        self._pending = []
+        self._unwritten_by_game = Counter()
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._batch_written = asyncio.Event()
+        self._closed = False
+
+    def submit(
+        self,
+        game_id: UUID,
+        session_id: UUID,
+        validated_words: list[tuple[str, list[domain.Point]]],
+    ) -> None:
+        """Accept _validated_ words for this session id, to be written shortly."""
+        if self._closed:
+            raise ValueError("Cannot submit words to a closed writer")
+        self._pending.extend(
+            data_models.VersusGameSubmittedWord(
+                id=uuid4(),
+                game_id=game_id,
+                by_session_id=session_id,
+                tile_path=[data_models.Point(x=pt.x, y=pt.y) for pt in path],
+                word=word,
+            )
+            for (word, path) in validated_words
+        )
+        self._unwritten_by_game[game_id] += len(validated_words)
+        self._has_pending.set()
+        if len(self._pending) >= self._max_batch:
+            self._batch_full.set()
+
+    def has_unwritten(self, game_id: UUID) -> bool:
+        """Whether words accepted for the game are still waiting or being written."""
+        return self._unwritten_by_game[game_id] > 0
+
+    async def flush_game(self, game_id: UUID) -> None:
+        """Write the words accepted for the game so far now, rather than waiting for
+        the batch to fill or come due. Returns once they're written.
+        """
+        while self.has_unwritten(game_id):
+            batch_written = self._batch_written
+            self._batch_full.set()
+            await batch_written.wait()
+
+    async def run(self) -> None:
+        """Write batches as they come due, until closed and everything's written."""
+        while not self._closed or self._pending:
+            await self._has_pending.wait()
+            if not self._closed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._batch_full.wait(), self._max_delay_secs
+                    )
+            await self._flush()
+
+    def close(self) -> None:
+        """Stop accepting words. `run()` returns once everything's written."""
+        self._closed = True
+        self._has_pending.set()
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        self._has_pending.clear()
+        self._batch_full.clear()
+        if not batch:
+            return
+        SUBMITTED_WORDS_BATCH_SIZE.observe(len(batch))
+        try:
+            await self._write(batch)
+        finally:
+            for submitted_word in batch:
+                self._unwritten_by_game[submitted_word.game_id] -= 1
+                if self._unwritten_by_game[submitted_word.game_id] <= 0:
+                    del self._unwritten_by_game[submitted_word.game_id]
+            if self._on_written is not None:
+                for game_id in {submitted_word.game_id for submitted_word in batch}:
+                    self._on_written(game_id)
+            # Wake everyone waiting on this batch, later waiters wait on the next
+            self._batch_written.set()
+            self._batch_written = asyncio.Event()
+
+    async def _write(self, batch: list[data_models.VersusGameSubmittedWord]) -> None:
+        for attempt in range(1, WORD_WRITE_MAX_ATTEMPTS + 1):
+            if await self._try_write(batch):
+                return
+            if attempt < WORD_WRITE_MAX_ATTEMPTS:
+                await asyncio.sleep(self._max_delay_secs * 2**attempt)
+
+        # Still failing, don't let one bad game lose every other game's words
+        by_game: defaultdict[UUID, list[data_models.VersusGameSubmittedWord]] = (
+            defaultdict(list)
+        )
+        for submitted_word in batch:
+            by_game[submitted_word.game_id].append(submitted_word)
+        for submitted_words in by_game.values():
+            if not await self._try_write(submitted_words):
+                SUBMITTED_WORDS_DROPPED.inc(len(submitted_words))
+
+    async def _try_write(
+        self, submitted_words: list[data_models.VersusGameSubmittedWord]
+    ) -> bool:
+        """Write the words in one go. Returns whether that succeeded."""
+        try:
+            async with self._backend.repositories() as repositories:
+                await repositories.versus_game.insert_versus_game_submitted_words_batch(
+                    submitted_words
+                )
+        except Exception:
+            logger.exception("Writing %d submitted words failed", len(submitted_words))
+            return False
+        return True
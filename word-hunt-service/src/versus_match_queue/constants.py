@@ -0,0 +1,9 @@
+QUEUE_MATCH_WINDOW_SECS = 15
+"""Only sessions that joined the queue this recently may be matched with."""
+
+QUEUE_EXPIRY_SECS = 20
+"""After this long, a queue entry expires and stops waiting for a match.
+
+Longer than `QUEUE_MATCH_WINDOW_SECS`: better to check too long than to expire
+concurrently with someone matching us.
+"""
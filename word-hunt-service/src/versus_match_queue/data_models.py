@@ -8,6 +8,7 @@ class VersusGamesMatchQueueEntry(BaseModel):
     id: UUID
     queued_player_session_id: UUID
     join_time: datetime
+    mode: str
     game_id: UUID | None
     matched_player_session_id: UUID | None
     match_time: datetime | None
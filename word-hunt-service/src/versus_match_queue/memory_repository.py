@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from src.versus_match_queue import data_models
+from src.versus_match_queue.constants import (
+    QUEUE_EXPIRY_SECS,
+    QUEUE_MATCH_WINDOW_SECS,
+)
+from src.versus_match_queue.repository import VersusMatchQueueRepository
+
+
+class InMemoryVersusMatchQueueStore:
+    """The versus match queue held in process memory, shared by every repository.
+
+    Entries are kept in join order, so expired ones are pruned from the front.
+    """
+
+    entries: dict[UUID, data_models.VersusGamesMatchQueueEntry]
+
+    def __init__(self) -> None:
+        self.entries = {}
+
+    def prune(self) -> None:
+        """Forget entries that have expired, nothing reads them anymore."""
+        cutoff = datetime.now() - timedelta(seconds=QUEUE_EXPIRY_SECS)
+        for entry_id, entry in list(self.entries.items()):
+            if entry.join_time > cutoff:
+                break
+            del self.entries[entry_id]
+
+
+class InMemoryVersusMatchQueueRepository(VersusMatchQueueRepository):
+    """A versus match queue repository over an in-memory store, see
+    `InMemoryRepositoryBackend`.
+    """
+
+    _store: InMemoryVersusMatchQueueStore
+
+    def __init__(self, store: InMemoryVersusMatchQueueStore) -> None:
+        self._store = store
+
+    async def _db_versus_queue_join(self, session_id: UUID, mode_name: str) -> UUID:
+        """Join the versus queue, or rejoin the session's open entry for the mode.
+        Returns queue entry id.
+        """
+        self._store.prune()
+        cutoff = datetime.now() - timedelta(seconds=QUEUE_MATCH_WINDOW_SECS)
+        for entry in reversed(self._store.entries.values()):
+            if (
+                entry.queued_player_session_id == session_id
+                and entry.mode == mode_name
+                and entry.game_id is None
+                and entry.join_time > cutoff
+            ):
+                return entry.id
+
+        queue_entry_id = uuid4()
+        self._store.entries[queue_entry_id] = data_models.VersusGamesMatchQueueEntry(
+            id=queue_entry_id,
+            queued_player_session_id=session_id,
+            join_time=datetime.now(),
+            mode=mode_name,
+            game_id=None,
+            matched_player_session_id=None,
+            match_time=None,
+        )
+        return queue_entry_id
+
+    async def _db_versus_queue_check(
+        self, queue_entry_id: UUID
+    ) -> tuple[tuple[UUID, UUID] | None, bool]:
+        """Check the status of an entry after joining the versus queue.
+
+        Returns ((game_id, matched_player_session_id), expired).
+        """
+        cutoff = datetime.now() - timedelta(seconds=QUEUE_EXPIRY_SECS)
+        entry = self._store.entries.get(queue_entry_id)
+        if entry is None or entry.join_time <= cutoff:
+            return None, True
+        if entry.game_id is None:
+            return None, False
+        if entry.matched_player_session_id is None:
+            raise ValueError(f"Missing matched session id for game {entry.game_id}")
+        return (entry.game_id, entry.matched_player_session_id), False
+
+    async def _db_versus_queue_match(
+        self, session_id: UUID, mode_name: str
+    ) -> tuple[UUID, UUID] | None:
+        """Attempt to match with an existing session on the match queue.
+
+        Returns (game_id, matched_player_session_id).
+        """
+        cutoff = datetime.now() - timedelta(seconds=QUEUE_MATCH_WINDOW_SECS)
+
+        def matchable(entry: data_models.VersusGamesMatchQueueEntry) -> bool:
+            return (
+                entry.join_time > cutoff
+                and entry.game_id is None
+                and entry.queued_player_session_id != session_id
+                and entry.mode == mode_name
+            )
+
+        # Take the longest-waiting session, entries are in join order
+        other = next(filter(matchable, self._store.entries.values()), None)
+        if other is None:
+            return None
+
+        # Like the Postgres query, match every open entry the other session has
+        game_id = uuid4()
+        now = datetime.now()
+        for entry_id, entry in self._store.entries.items():
+            if (
+                matchable(entry)
+                and entry.queued_player_session_id == other.queued_player_session_id
+            ):
+                self._store.entries[entry_id] = entry.model_copy(
+                    update={
+                        "game_id": game_id,
+                        "matched_player_session_id": session_id,
+                        "match_time": now,
+                    }
+                )
+        return game_id, other.queued_player_session_id
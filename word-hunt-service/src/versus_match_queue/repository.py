@@ -1,29 +1,38 @@
 import time
+from abc import ABC, abstractmethod
 from asyncio import sleep
 from uuid import UUID, uuid4
 
 from psycopg import AsyncConnection
 from psycopg.rows import class_row
 
+from src.instrumentation.metrics import POLL_ITERATIONS, timed_query
 from src.versus_match_queue import data_models, domain
+from src.versus_match_queue.constants import (
+    QUEUE_EXPIRY_SECS,
+    QUEUE_MATCH_WINDOW_SECS,
+)
 
 
-class VersusMatchQueueRepository:
-    _db_conn: AsyncConnection
+class VersusMatchQueueRepository(ABC):
+    """The versus match queue, matching sessions over the storage's primitives.
 
-    def __init__(self, db_conn: AsyncConnection) -> None:
-        self._db_conn = db_conn
+    Backends implement the `_db_*` primitives, with the same expiry windows.
+    """
 
     async def match(
         self,
         session_id: UUID,
+        mode_name: str,
         poll_interval: float = 0.1,
         limit_poll_time: float = 30.0,
     ) -> domain.VersusQueueMatch | None:
-        """Attempt to find a match for a versus game."""
+        """Attempt to find a match for a versus game, only with sessions wanting the
+        same game mode.
+        """
 
         # First, try to match with an existing session on the queue
-        match_result = await self._db_versus_queue_match(session_id)
+        match_result = await self._db_versus_queue_match(session_id, mode_name)
         if match_result is not None:
             # We received a match, it's caller's responsibility to construct the game
             game_id, other_session_id = match_result
@@ -34,11 +43,12 @@ class VersusMatchQueueRepository:
             )
 
         # We didn't match, join the queue
-        queue_entry_id = await self._db_versus_queue_join(session_id)
+        queue_entry_id = await self._db_versus_queue_join(session_id, mode_name)
 
         # Poll until we're assigned a match
         start_time = time.time()
         while (time.time() - start_time) < limit_poll_time:  # Just-in-case limit
+            POLL_ITERATIONS.inc(loop="match_queue_check")
             check_result, expired = await self._db_versus_queue_check(queue_entry_id)
             if check_result is not None:
                 # We were given a match, the partner will construct the game
@@ -55,20 +65,84 @@ class VersusMatchQueueRepository:
         # Poll timeout expired, exit with no match
         return None
 
-    async def _db_versus_queue_join(self, session_id: UUID) -> UUID:
-        """Join the versus queue. Returns queue entry id."""
+    @abstractmethod
+    async def _db_versus_queue_join(self, session_id: UUID, mode_name: str) -> UUID:
+        """Join the versus queue, or rejoin the session's entry for the mode if it's
+        still open to matching. Returns queue entry id.
 
-        query = """
-        INSERT INTO versus_games_match_queue (id, queued_player_session_id)
-        VALUES (%s, %s)
+        Concurrent joins by one session, e.g. on different workers, share one entry.
         """
-        queue_entry_id = uuid4()
-        await self._db_conn.execute(
-            query,
-            (queue_entry_id, session_id),
-        )
-        return queue_entry_id
 
+    @abstractmethod
+    async def _db_versus_queue_check(
+        self, queue_entry_id: UUID
+    ) -> tuple[tuple[UUID, UUID] | None, bool]:
+        """Check the status of an entry after joining the versus queue.
+
+        Entries expire `QUEUE_EXPIRY_SECS` after joining.
+
+        Returns ((game_id, matched_player_session_id), expired).
+        """
+
+    @abstractmethod
+    async def _db_versus_queue_match(
+        self, session_id: UUID, mode_name: str
+    ) -> tuple[UUID, UUID] | None:
+        """Attempt to match with the oldest other session wanting the same mode, within
+        the match window.
+
+        Returns (game_id, matched_player_session_id).
+        """
+
+
+class PostgresVersusMatchQueueRepository(VersusMatchQueueRepository):
+    _db_conn: AsyncConnection
+
+    def __init__(self, db_conn: AsyncConnection) -> None:
+        self._db_conn = db_conn
+
+    @timed_query
+    async def _db_versus_queue_join(self, session_id: UUID, mode_name: str) -> UUID:
+        """Join the versus queue, or rejoin the session's open entry for the mode.
+        Returns queue entry id.
+        """
+
+        open_entry_query = """
+        SELECT id FROM versus_games_match_queue
+        WHERE queued_player_session_id = %s
+            AND mode = %s
+            AND game_id IS NULL
+            AND join_time > NOW() - make_interval(secs => %s)
+        ORDER BY join_time DESC
+        LIMIT 1
+        """
+        insert_query = """
+        INSERT INTO versus_games_match_queue (id, queued_player_session_id, mode)
+        VALUES (%s, %s, %s)
+        """
+
+        # Hold a lock on the session and mode, so a concurrent join sees our insert
+        async with self._db_conn.transaction():
+            await self._db_conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))",
+                (f"versus_queue:{session_id}:{mode_name}",),
+            )
+            async with self._db_conn.cursor() as cur:
+                await cur.execute(
+                    open_entry_query, (session_id, mode_name, QUEUE_MATCH_WINDOW_SECS)
+                )
+                result = await cur.fetchone()
+                if result is not None:
+                    return result[0]
+
+            queue_entry_id = uuid4()
+            await self._db_conn.execute(
+                insert_query,
+                (queue_entry_id, session_id, mode_name),
+            )
+            return queue_entry_id
+
+    @timed_query
     async def _db_versus_queue_check(
         self, queue_entry_id: UUID
     ) -> tuple[tuple[UUID, UUID] | None, bool]:
@@ -82,12 +156,12 @@ class VersusMatchQueueRepository:
         query = """
         SELECT * FROM versus_games_match_queue
         WHERE id = %s
-            AND join_time > NOW() - INTERVAL '20 second'
+            AND join_time > NOW() - make_interval(secs => %s)
         """
         async with self._db_conn.cursor(
             row_factory=class_row(data_models.VersusGamesMatchQueueEntry)
         ) as cur:
-            await cur.execute(query, (queue_entry_id,))
+            await cur.execute(query, (queue_entry_id, QUEUE_EXPIRY_SECS))
             result = await cur.fetchone()
             if result is None:
                 return None, True
@@ -99,8 +173,9 @@ class VersusMatchQueueRepository:
                 )
             return (result.game_id, result.matched_player_session_id), False
 
+    @timed_query
     async def _db_versus_queue_match(
-        self, session_id: UUID
+        self, session_id: UUID, mode_name: str
     ) -> tuple[UUID, UUID] | None:
         """Attempt to match with an existing session on the match queue.
 
@@ -114,16 +189,18 @@ class VersusMatchQueueRepository:
         SET game_id = %s, matched_player_session_id = %s, match_time = NOW()
         WHERE queued_player_session_id = (
                 SELECT queued_player_session_id FROM versus_games_match_queue
-                WHERE join_time > NOW() - INTERVAL '15 second'
+                WHERE join_time > NOW() - make_interval(secs => %s)
                     AND game_id IS NULL
                     AND queued_player_session_id != %s
+                    AND mode = %s
                 ORDER BY join_time ASC
                 LIMIT 1
                 FOR UPDATE
             )
-            AND join_time > NOW() - INTERVAL '15 second'
+            AND join_time > NOW() - make_interval(secs => %s)
             AND game_id IS NULL
             AND queued_player_session_id != %s
+            AND mode = %s
         RETURNING *
         """
 
@@ -131,7 +208,19 @@ class VersusMatchQueueRepository:
             row_factory=class_row(data_models.VersusGamesMatchQueueEntry)
         ) as cur:
             game_id = uuid4()
-            await cur.execute(query, (game_id, session_id, session_id, session_id))
+            await cur.execute(
+                query,
+                (
+                    game_id,
+                    session_id,
+                    QUEUE_MATCH_WINDOW_SECS,
+                    session_id,
+                    mode_name,
+                    QUEUE_MATCH_WINDOW_SECS,
+                    session_id,
+                    mode_name,
+                ),
+            )
             result = await cur.fetchone()
             if result is None:
                 return None